@@ -11,7 +11,7 @@ import json
 import shutil
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -304,9 +304,11 @@ class ConfigManager:
             # 确保目录存在
             os.makedirs(os.path.dirname(config_file), exist_ok=True)
             
-            # 保存配置
-            with open(config_file, 'w', encoding='utf-8') as f:
+            # 先写入临时文件再替换，避免写入中断导致配置文件损坏
+            temp_file = config_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(config_data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, config_file)
             
             return True
         except Exception as e:
@@ -346,22 +348,67 @@ class ConfigManager:
         Returns:
             bool: 保存成功返回True，失败返回False
         """
+        entries = self._prepare_group_save(group_name)
+        if entries is None:
+            return False
+        
+        return all(self.save_config(config_file, data) for config_file, data in entries)
+    
+    def save_all(self, group_names: List[str] = None) -> bool:
+        """批量保存多个配置分组
+        
+        多个分组写入同一文件时只写入一次
+        
+        Args:
+            group_names: 配置分组名称列表，默认为None，保存所有分组
+            
+        Returns:
+            bool: 全部保存成功返回True，否则返回False
+        """
+        if group_names is None:
+            group_names = list(self.config_groups.keys())
+        
+        success = True
+        # 文件路径 -> 数据，后处理的分组覆盖先处理的分组
+        pending = {}
+        for group_name in group_names:
+            entries = self._prepare_group_save(group_name)
+            if entries is None:
+                success = False
+                continue
+            pending.update(entries)
+        
+        for config_file, data in pending.items():
+            if not self.save_config(config_file, data):
+                success = False
+        
+        return success
+    
+    def _prepare_group_save(self, group_name: str) -> Optional[List[Tuple[str, Any]]]:
+        """将配置分组同步到对应的配置数据，返回需要写入的文件
+        
+        Args:
+            group_name: 配置分组名称
+            
+        Returns:
+            List[Tuple[str, Any]]: (文件路径, 数据)列表，分组不存在时返回None
+        """
         if group_name not in self.config_groups:
             logger.error(f"未找到配置分组: {group_name}")
-            return False
+            return None
             
         group = self.config_groups[group_name]
         
         # 根据分组类型保存到对应的配置文件
         if group_name == "system":
             self.system_config = group.items
-            return self.save_system_config()
+            return [(self.system_config_file, self.system_config)]
         elif group_name == "user":
             self.user_config = group.items
-            return self.save_user_config()
+            return [(self.user_config_file, self.user_config)]
         elif group_name == "ui":
             self.ui_config = group.items
-            return self.save_ui_config()
+            return [(self.ui_config_file, self.ui_config)]
         elif group_name == "date":
             # 更新用户配置中的相关项
             self.user_config["work_days"] = group.items["work_days"]
@@ -369,15 +416,15 @@ class ConfigManager:
             self.user_config["reminder_advance_minutes"] = group.items["reminder_advance_minutes"]
             # 保存日期配置
             date_config_file = os.path.join(self.config_dir, 'date_config.json')
-            return self.save_config(date_config_file, group.items) and self.save_user_config()
+            return [(date_config_file, group.items), (self.user_config_file, self.user_config)]
         elif group_name == "flow":
             # 保存流程图配置
             flow_config_file = os.path.join(self.config_dir, 'flow_config.json')
-            return self.save_config(flow_config_file, group.items)
+            return [(flow_config_file, group.items)]
         else:
             # 自定义分组，保存到单独的文件
             custom_config_file = os.path.join(self.config_dir, f'{group_name}_config.json')
-            return self.save_config(custom_config_file, group.items)
+            return [(custom_config_file, group.items)]
     
     def get_config_value(self, group_name: str, key: str, default=None) -> Any:
         """获取配置项的值
@@ -11,6 +11,7 @@ import json
 import time
 import uuid
 from datetime import datetime, timedelta
+from operator import itemgetter
 
 class SchedulerManager:
     """调度管理器类，负责任务的管理和存储"""
@@ -37,6 +38,10 @@ class SchedulerManager:
         # 确保数据目录存在
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
         
+        # 任务列表版本号，任务被加载或保存时递增，用于使排序缓存失效
+        self._tasks_version = 0
+        self._sorted_cache = None  # (版本号, 按开始时间排序的任务列表)
+        
         # 加载任务数据
         self.tasks = []
         self.load_tasks()
@@ -56,6 +61,7 @@ class SchedulerManager:
         Returns:
             bool: 加载成功返回True，失败返回False
         """
+        self._tasks_version += 1
         try:
             # 如果文件不存在，创建空文件
             if not os.path.exists(self.data_file):
@@ -144,6 +150,8 @@ class SchedulerManager:
         Returns:
             bool: 保存成功返回True，失败返回False
         """
+        # 所有增删改都经过保存，在这里使排序缓存失效
+        self._tasks_version += 1
         try:
             # 确保json模块已导入
             import json
@@ -465,6 +473,28 @@ class SchedulerManager:
         
         return valid_tasks
     
+    def get_all_tasks_sorted(self):
+        """获取按开始时间排序的所有任务
+        
+        排序结果按任务列表版本号缓存，任务未变化时不会重新排序
+        
+        Returns:
+            list: 按开始时间升序排列的任务列表（副本）
+        """
+        cache = self._sorted_cache
+        if cache is None or cache[0] != self._tasks_version:
+            # 预先计算时间戳，避免排序时反复比较datetime对象
+            keyed = []
+            for task in self.get_all_tasks():
+                start_time = task.get("start_time")
+                ts = start_time.timestamp() if isinstance(start_time, datetime) else float("-inf")
+                keyed.append((ts, task))
+            keyed.sort(key=itemgetter(0))
+            cache = (self._tasks_version, [task for _, task in keyed])
+            self._sorted_cache = cache
+        
+        return list(cache[1])
+    
     def get_tasks_by_date(self, date):
         """获取指定日期的任务
         
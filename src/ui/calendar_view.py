@@ -7,9 +7,15 @@
 """
 
 import calendar
+import logging
+import math
+import time
 from datetime import datetime, timedelta
-from PyQt5.QtCore import Qt, QDate, QRect, QSize, pyqtSignal, QTimer
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush
+from PyQt5.QtCore import Qt, QDate, QRect, QLine, QPointF, QSize, pyqtSignal, QTimer
+from PyQt5.QtGui import (
+    QPainter, QColor, QPen, QBrush, QPixmap, QPixmapCache,
+    QStaticText, QTransform
+)
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QScrollArea, QCalendarWidget, QFrame, 
@@ -24,6 +30,40 @@ from qfluentwidgets import (
 )
 
 from ui.task_dialog import TaskDialog
+from ui.fonts import yahei, font_metrics, YAHEI_9_BOLD, YAHEI_9, YAHEI_8
+
+logger = logging.getLogger(__name__)
+
+# 星期名称，索引0对应周一
+_WEEKDAY_NAMES = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
+# 时间轴的小时文本，索引即小时
+_HOUR_STRINGS = tuple(f"{hour:02d}:00" for hour in range(24))
+
+# 周视图标题和时间轴使用的调色板，模块加载时创建一次
+_COL_HEADER_BG = QColor(245, 245, 245)  # 标题默认背景
+_COL_TODAY_BG = QColor(220, 237, 255)  # 今天高亮背景
+_COL_WEEKEND_BG = QColor(252, 245, 245)  # 周末背景
+_COL_TODAY_BORDER = QColor(100, 181, 246)  # 蓝色边框
+_COL_WEEKEND_BORDER = QColor(239, 154, 154)  # 淡红色边框
+_COL_GREY = QColor(200, 200, 200)  # 普通边框
+_COL_RED = QColor(239, 83, 80)  # 周末文本
+_COL_DARK = QColor(33, 33, 33)  # 普通文本
+_COL_BLUE = QColor(33, 150, 243)  # 今天文本
+_COL_WORK = QColor(30, 30, 30)  # 工作时间文本
+_COL_OFFWORK = QColor(120, 120, 120)  # 非工作时间文本
+_COL_BG_EVEN = QColor(248, 248, 248)  # 偶数小时背景
+_COL_BG_ODD = QColor(245, 245, 245)  # 奇数小时背景
+_COL_SEP = QColor(220, 220, 220)  # 时间轴分隔线
+
+class ViewType:
+    """日历视图类型，与视图下拉框的索引一一对应"""
+    MONTH = 0
+    WEEK = 1
+    DAY = 2
+    
+    # 下拉框中显示的名称
+    NAMES = ("月视图", "周视图", "日视图")
 
 class CalendarTaskWidget(QWidget):
     """日历中的任务小部件"""
@@ -111,7 +151,7 @@ class CalendarTaskWidget(QWidget):
         text_rect = QRect(4, 0, self.width() - 8, self.height())
         
         # 设置较小字体以适应紧凑布局
-        painter.setFont(QFont("Microsoft YaHei", 7))
+        painter.setFont(yahei(7))
         fm = painter.fontMetrics()
         available_width = text_rect.width()
         
@@ -125,8 +165,8 @@ class CalendarTaskWidget(QWidget):
         full_time = f"{start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')}"
         
         # 计算各部分文本宽度
-        short_time_width = fm.width(short_time)
-        full_time_width = fm.width(full_time)
+        short_time_width = fm.horizontalAdvance(short_time)
+        full_time_width = fm.horizontalAdvance(full_time)
         
         # 选择合适的时间格式
         if full_time_width + 10 <= available_width:  # 留出至少10px给标题
@@ -142,7 +182,7 @@ class CalendarTaskWidget(QWidget):
         # 如果有空间显示标题
         if title_available_width > 10:  # 至少能显示几个字符
             # 如果标题太长，进行截断
-            if fm.width(title) > title_available_width:
+            if fm.horizontalAdvance(title) > title_available_width:
                 title = fm.elidedText(title, Qt.ElideRight, title_available_width)
             
             # 绘制完整文本
@@ -251,29 +291,10 @@ class DayWidget(QWidget):
         start_datetime = datetime.combine(self.date.toPyDate(), datetime.min.time().replace(hour=9))
         end_datetime = datetime.combine(self.date.toPyDate(), datetime.min.time().replace(hour=10))
         
-        # 创建任务数据
-        task_data = {
-            "id": None,  # 新任务，ID为空
-            "title": "",
-            "description": "",
-            "start_time": start_datetime,
-            "end_time": end_datetime,
-            "priority": "中",
-            "status": "未开始",
-            "completed": False
-        }
-        
-        # 打开任务编辑对话框
-        dialog = TaskDialog(
-            self.window(), 
-            self.scheduler_manager, 
-            self.window().config_manager,
-            self.window().subtask_manager,
-            task_data
-        )
-        if dialog.exec_():
-            # 通知日历视图刷新
-            self.window().findChild(CalendarView).refresh()
+        # 通过日历视图打开任务编辑对话框，保存后由日历视图负责刷新
+        calendar_view = self.window().findChild(CalendarView)
+        if calendar_view:
+            calendar_view._open_task_dialog_for(start_datetime, end_datetime)
     
     def view_day_detail(self):
         """查看日视图详情"""
@@ -283,7 +304,7 @@ class DayWidget(QWidget):
             # 设置当前日期
             calendar_view.current_date = self.date
             # 切换到日视图
-            calendar_view.view_combo.setCurrentText("日视图")
+            calendar_view.view_combo.setCurrentIndex(ViewType.DAY)
     
     def edit_task(self, task_data):
         """编辑任务"""
@@ -299,9 +320,7 @@ class DayWidget(QWidget):
                 # 通知日历视图刷新
                 self.window().findChild(CalendarView).refresh()
         except Exception as e:
-            print(f"编辑任务时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("编辑任务时出错")
             
             InfoBar.error(
                 title="错误",
@@ -314,12 +333,30 @@ class DayWidget(QWidget):
 class CalendarView(ScrollArea):
     """日历视图"""
     
+    # 新建任务的默认字段
+    _DEFAULT_TASK_TEMPLATE = {
+        "title": "",
+        "description": "",
+        "priority": "中",
+        "status": "未开始",
+        "completed": False
+    }
+    
     def __init__(self, scheduler_manager, parent=None):
         super().__init__(parent)
         self.scheduler_manager = scheduler_manager
         self.current_date = QDate.currentDate()
         self.selected_date = self.current_date
         self.is_updating = False  # 添加标志以防止递归
+        self._current_view = ViewType.MONTH  # 当前视图类型，仅在视图切换时更新
+        self._monday_cache = (None, None)  # (日期, 所在周的周一) 缓存
+        self._week_day_headers = []  # 当前周视图的日期标题
+        
+        # 午夜定时器，跨越午夜时统一更新"今天"高亮，无需每个标题各自检查
+        self._midnight_timer = QTimer(self)
+        self._midnight_timer.setSingleShot(True)
+        self._midnight_timer.timeout.connect(self._roll_today)
+        self._schedule_midnight_roll()
         
         # 初始化界面
         self.init_ui()
@@ -374,8 +411,8 @@ class CalendarView(ScrollArea):
         
         # 添加视图切换按钮
         self.view_combo = ComboBox(self)
-        self.view_combo.addItems(["月视图", "周视图", "日视图"])
-        self.view_combo.setCurrentIndex(0)
+        self.view_combo.addItems(list(ViewType.NAMES))
+        self.view_combo.setCurrentIndex(ViewType.MONTH)
         self.view_combo.currentIndexChanged.connect(self.on_view_changed)
         self.toolbar_layout.addWidget(QLabel("视图: "))
         self.toolbar_layout.addWidget(self.view_combo)
@@ -385,12 +422,13 @@ class CalendarView(ScrollArea):
         # 添加星期标签
         self.week_layout = QHBoxLayout()
         self.week_layout.setContentsMargins(0, 0, 0, 0)  # 移除边距
-        weekdays = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-        for day in weekdays:
+        self._week_header_widgets = []  # 缓存星期标签，切换视图时直接遍历
+        for day in _WEEKDAY_NAMES:
             label = QLabel(day, self)
             label.setAlignment(Qt.AlignCenter)
             label.setStyleSheet("font-weight: bold; padding: 3px;")  # 减少内边距
             self.week_layout.addWidget(label)
+            self._week_header_widgets.append(label)
         
         self.main_layout.addLayout(self.week_layout)
         
@@ -492,6 +530,7 @@ class CalendarView(ScrollArea):
                 self.calendar_widget = None
 
         # 清理周视图
+        self._week_day_headers = []
         if hasattr(self, 'week_widget') and self.week_widget and self.week_widget.isWidgetType():
             try:
                 self.main_layout.removeWidget(self.week_widget)
@@ -523,10 +562,7 @@ class CalendarView(ScrollArea):
             self.clean_views()
             
             # 确保星期标题行在月视图中可见
-            for i in range(self.week_layout.count()):
-                item = self.week_layout.itemAt(i)
-                if item and item.widget():
-                    item.widget().setVisible(True)
+            self._set_week_header_visible(True)
             
             # 创建新的日历小部件和布局
             self.calendar_widget = QWidget(self)
@@ -557,6 +593,34 @@ class CalendarView(ScrollArea):
         finally:
             self.is_updating = False  # 清除更新标志
     
+    def _set_week_header_visible(self, visible):
+        """批量设置星期标签行的可见性，期间暂停重绘以合并布局更新"""
+        self.main_widget.setUpdatesEnabled(False)
+        try:
+            for label in self._week_header_widgets:
+                label.setVisible(visible)
+        finally:
+            self.main_widget.setUpdatesEnabled(True)
+    
+    def _schedule_midnight_roll(self):
+        """安排在下一个午夜触发_roll_today"""
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        msecs = int((next_midnight - now).total_seconds() * 1000) + 1
+        self._midnight_timer.start(msecs)
+    
+    def _roll_today(self):
+        """跨越午夜：更新日期标题的今天状态，只有状态变化的标题会重绘"""
+        today = datetime.now().date()
+        WeekDayHeader._today_cache = (today, time.monotonic())
+        for header in self._week_day_headers:
+            try:
+                header.set_today(header.date.toPyDate() == today)
+            except RuntimeError:
+                # 标题已被销毁
+                pass
+        self._schedule_midnight_roll()
+    
     def on_month_changed(self, date):
         """月份变化处理"""
         if self.is_updating:  # 如果已经在更新中，则直接返回
@@ -568,17 +632,17 @@ class CalendarView(ScrollArea):
     
     def update_navigation_buttons(self):
         """根据当前视图类型更新导航按钮文本"""
-        view_type = self.view_combo.currentText()
+        view_type = self._current_view
         
-        if view_type == "月视图":
+        if view_type == ViewType.MONTH:
             self.prev_btn.setText("上个月")
             self.today_btn.setText("本月")
             self.next_btn.setText("下个月")
-        elif view_type == "周视图":
+        elif view_type == ViewType.WEEK:
             self.prev_btn.setText("上一周")
             self.today_btn.setText("本周")
             self.next_btn.setText("下一周")
-        elif view_type == "日视图":
+        elif view_type == ViewType.DAY:
             self.prev_btn.setText("前一天")
             self.today_btn.setText("今天")
             self.next_btn.setText("后一天")
@@ -588,9 +652,9 @@ class CalendarView(ScrollArea):
         if self.is_updating:
             return
             
-        view_type = self.view_combo.currentText()
+        view_type = self._current_view
         
-        if view_type == "月视图":
+        if view_type == ViewType.MONTH:
             # 上个月
             year = self.current_date.year()
             month = self.current_date.month() - 1
@@ -604,16 +668,16 @@ class CalendarView(ScrollArea):
             self.selected_date = self.current_date
             self.load_month_tasks()
             
-        elif view_type == "周视图":
+        elif view_type == ViewType.WEEK:
             # 上一周
             # 确保总是以周一为起点
-            current_monday = self.get_monday_of_week(self.current_date)
+            current_monday = self._current_monday()
             # 前一周的周一是当前周一减7天
             prev_monday = current_monday.addDays(-7)
             self.current_date = prev_monday
             self.create_week_view(prev_monday)
             
-        elif view_type == "日视图":
+        elif view_type == ViewType.DAY:
             # 前一天
             self.current_date = self.current_date.addDays(-1)
             self.create_day_view(self.current_date)
@@ -623,9 +687,9 @@ class CalendarView(ScrollArea):
         if self.is_updating:
             return
             
-        view_type = self.view_combo.currentText()
+        view_type = self._current_view
         
-        if view_type == "月视图":
+        if view_type == ViewType.MONTH:
             # 下个月
             year = self.current_date.year()
             month = self.current_date.month() + 1
@@ -639,16 +703,16 @@ class CalendarView(ScrollArea):
             self.selected_date = self.current_date
             self.load_month_tasks()
             
-        elif view_type == "周视图":
+        elif view_type == ViewType.WEEK:
             # 下一周
             # 确保总是以周一为起点
-            current_monday = self.get_monday_of_week(self.current_date)
+            current_monday = self._current_monday()
             # 下一周的周一是当前周一加7天
             next_monday = current_monday.addDays(7)
             self.current_date = next_monday
             self.create_week_view(next_monday)
             
-        elif view_type == "日视图":
+        elif view_type == ViewType.DAY:
             # 后一天
             self.current_date = self.current_date.addDays(1)
             self.create_day_view(self.current_date)
@@ -658,10 +722,10 @@ class CalendarView(ScrollArea):
         if self.is_updating:
             return
             
-        view_type = self.view_combo.currentText()
+        view_type = self._current_view
         today = QDate.currentDate()
         
-        if view_type == "月视图":
+        if view_type == ViewType.MONTH:
             # 本月
             year = today.year()
             month = today.month()
@@ -669,24 +733,30 @@ class CalendarView(ScrollArea):
             self.selected_date = today
             self.load_month_tasks()
             
-        elif view_type == "周视图":
+        elif view_type == ViewType.WEEK:
             # 本周，从本周的周一开始
-            current_monday = self.get_monday_of_week(today)
+            current_monday = self._monday_of(today)
             self.current_date = current_monday
             self.create_week_view(current_monday)
             
-        elif view_type == "日视图":
+        elif view_type == ViewType.DAY:
             # 今天
             self.current_date = today
             self.create_day_view(self.current_date)
             
-    def get_monday_of_week(self, date):
-        """获取指定日期所在周的周一日期"""
-        days_to_monday = date.dayOfWeek() - 1
-        # 处理周日的特殊情况
-        if days_to_monday < 0:
-            days_to_monday = 6
-        return date.addDays(-days_to_monday)
+    @staticmethod
+    def _monday_of(date):
+        """获取指定日期所在周的周一日期
+
+        QDate.dayOfWeek()返回1（周一）到7（周日），取模后无需单独处理周日
+        """
+        return date.addDays(-((date.dayOfWeek() - 1) % 7))
+    
+    def _current_monday(self):
+        """获取当前日期所在周的周一，仅在当前日期变化时重新计算"""
+        if self._monday_cache[0] != self.current_date:
+            self._monday_cache = (self.current_date, self._monday_of(self.current_date))
+        return self._monday_cache[1]
     
     def create_week_view(self, start_date):
         """创建周视图"""
@@ -725,14 +795,7 @@ class CalendarView(ScrollArea):
             header_layout.addWidget(time_axis_header)
             
             # 确保始终从周一开始显示
-            first_day_of_week = start_date.dayOfWeek()
-            if first_day_of_week != 1:  # 如果不是周一
-                # 计算到最近的周一的天数差
-                days_to_monday = -(first_day_of_week - 1)
-                if days_to_monday == 0:
-                    days_to_monday = -6  # 如果是周日，回退6天到上周一
-                # 调整开始日期
-                start_date = start_date.addDays(days_to_monday)
+            start_date = self._monday_of(start_date)
             
             # 添加每天的标题
             self.header_dates = []  # 存储为实例属性以便后续访问
@@ -740,6 +803,7 @@ class CalendarView(ScrollArea):
                 day_date = start_date.addDays(i)
                 self.header_dates.append(day_date)
                 day_header = WeekDayHeader(day_date)
+                self._week_day_headers.append(day_header)
                 # 设置拉伸因子为1，使所有标题均匀分布
                 header_layout.addWidget(day_header, 1)
                 
@@ -765,30 +829,14 @@ class CalendarView(ScrollArea):
             content_layout.setSpacing(0)
             content_scroll.setWidget(content_widget)
             
-            # 创建时间轴
-            time_axis = QWidget()
-            time_axis.setFixedWidth(50)  # 增加宽度以适应时间标签
-            time_axis.setStyleSheet("background-color: #F2F2F2; border-right: 1px solid #E0E0E0;")
-            time_axis_layout = QVBoxLayout(time_axis)
-            time_axis_layout.setContentsMargins(0, 0, 0, 0)
-            time_axis_layout.setSpacing(0)
-            
-            # 工作时间索引，用于滚动
-            work_hour_index = None
-            
             # 每小时高度
             hour_height = 50
             
-            # 添加小时标签
-            for hour_idx, hour in enumerate(range(0, 24)):
-                # 记录工作开始时间
-                if hour == 9:
-                    work_hour_index = hour_idx
-                    
-                hour_label = HourlyLabel(hour)
-                hour_label.setFixedHeight(hour_height)
-                time_axis_layout.addWidget(hour_label)
+            # 工作时间索引（早上9点），用于滚动
+            work_hour_index = 9
             
+            # 创建时间轴，由单个部件绘制全部小时刻度
+            time_axis = TimelineAxis(hour_height)
             content_layout.addWidget(time_axis)
             
             # 创建任务区域容器
@@ -804,7 +852,7 @@ class CalendarView(ScrollArea):
                 day_date = self.header_dates[i]
                 
                 # 创建列容器
-                day_column = QWidget()
+                day_column = TaskContainer()
                 day_column.setObjectName(f"dayColumn_{i}")
                 day_column.setStyleSheet("background-color: white;")
                 day_column.setFixedHeight(24 * hour_height)  # 总高度
@@ -980,17 +1028,8 @@ class CalendarView(ScrollArea):
                             x_pos = 5 + task_index * task_width
                             
                             # 创建任务小部件
-                            task_widget = WeekTaskWidget(task)
-                            task_widget.setParent(day_column)
+                            task_widget = self._create_task_widget(task, day_column)
                             task_widget.setGeometry(int(x_pos), int(start_y), int(task_width - 5), int(height))
-                            
-                            # 连接点击和上下文菜单事件
-                            task_widget.clicked.connect(lambda task_data=task: self.edit_task(task_data))
-                            task_widget.setContextMenuPolicy(Qt.CustomContextMenu)
-                            task_widget.customContextMenuRequested.connect(
-                                lambda pos, t=task: self.show_task_context_menu(pos, t)
-                            )
-                            
                             task_widget.show()
                             
                             # 记录已创建的小部件
@@ -1014,6 +1053,19 @@ class CalendarView(ScrollArea):
         finally:
             self.is_updating = False
             
+    def _create_task_widget(self, task, parent):
+        """创建周/日视图任务小部件，并在构造时一次性连接信号
+
+        clicked信号本身携带任务数据，因此直接连接到edit_task，无需额外的lambda
+        """
+        task_widget = WeekTaskWidget(task, parent)
+        task_widget.clicked.connect(self.edit_task)
+        task_widget.setContextMenuPolicy(Qt.CustomContextMenu)
+        task_widget.customContextMenuRequested.connect(
+            lambda pos, t=task: self.show_task_context_menu(pos, t)
+        )
+        return task_widget
+    
     def on_layout_done(self):
         """布局完成后的回调，用于初始化窗口大小变化处理"""
         # 为每列初始化大小变化事件处理
@@ -1026,14 +1078,16 @@ class CalendarView(ScrollArea):
                         
                     day_date = self.header_dates[i]
                     
-                    # 设置大小调整事件处理
-                    day_column.resizeEvent = lambda event, column=day_column, date=day_date: self.column_resize_event(event, column, date)
+                    # 设置大小调整后的重新布局处理
+                    day_column.set_relayout_handler(
+                        lambda column, date=day_date: self.column_resize_event(column, date)
+                    )
         except (AttributeError, IndexError) as e:
             print(f"错误：{e}")
             # 可能不在周视图中或属性尚未初始化
             pass
     
-    def column_resize_event(self, event, column, day_date):
+    def column_resize_event(self, column, day_date):
         """周视图列大小调整事件处理"""
         # 获取当前列宽
         column_width = column.width()
@@ -1073,9 +1127,6 @@ class CalendarView(ScrollArea):
                 x_pos = 5 + idx * task_width
                 widget.setGeometry(int(x_pos), widget.y(), 
                                   int(task_width - 5), widget.height())
-        
-        # 调用原始的事件处理函数
-        QWidget.resizeEvent(column, event)
 
     def create_day_view(self, date):
         """创建日视图"""
@@ -1099,8 +1150,7 @@ class CalendarView(ScrollArea):
             day_layout.setSpacing(0)
             
             # 创建日期标题
-            weekday_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-            weekday = weekday_names[date.dayOfWeek() - 1]
+            weekday = _WEEKDAY_NAMES[date.dayOfWeek() - 1]
             date_str = date.toString("yyyy年MM月dd日")
             
             # 创建日期标题容器并设置自适应宽度
@@ -1179,7 +1229,7 @@ class CalendarView(ScrollArea):
             content_layout.addWidget(time_axis)
             
             # 创建任务区域
-            tasks_container = QWidget()
+            tasks_container = TaskContainer()
             tasks_container.setObjectName("tasksContainer")
             tasks_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
             tasks_container.setFixedHeight(48 * time_slot_height)  # 48个半小时时间槽
@@ -1399,27 +1449,16 @@ class CalendarView(ScrollArea):
                     x_pos = 5 + idx * task_width
                     
                     # 创建任务小部件
-                    task_widget = WeekTaskWidget(task)
-                    task_widget.setParent(tasks_container)
+                    task_widget = self._create_task_widget(task, tasks_container)
                     
                     # 设置位置和大小
                     task_widget.setGeometry(int(x_pos), int(start_y), int(task_width - 5), int(height))
-                    
-                    # 添加上下文菜单
-                    task_widget.setContextMenuPolicy(Qt.CustomContextMenu)
-                    task_widget.customContextMenuRequested.connect(
-                        lambda pos, t=task: self.show_task_context_menu(pos, t)
-                    )
-                    
-                    # 连接点击事件
-                    task_widget.clicked.connect(lambda t=task: self.edit_task(t))
-                    
                     task_widget.show()
                     print(f"创建任务组件: {task.get('title')} 位置:({int(x_pos)}, {int(start_y)}) 大小:({int(task_width - 5)}, {int(height)})")
             
             # 使用专门的大小调整事件处理器
-            tasks_container.resizeEvent = lambda event: self.tasks_container_resize_event(
-                event, tasks_container, time_slot_tasks, date
+            tasks_container.set_relayout_handler(
+                lambda container: self.tasks_container_resize_event(container, time_slot_tasks, date)
             )
             
             content_layout.addWidget(tasks_container, 1)  # 任务区域占据主要空间
@@ -1447,7 +1486,7 @@ class CalendarView(ScrollArea):
         finally:
             self.is_updating = False
             
-    def tasks_container_resize_event(self, event, container, time_slot_tasks, date):
+    def tasks_container_resize_event(self, container, time_slot_tasks, date):
         """处理任务容器大小变化事件"""
         try:
             # 清除现有任务小部件
@@ -1528,25 +1567,11 @@ class CalendarView(ScrollArea):
                     x_pos = 5 + idx * task_width
                     
                     # 创建任务小部件
-                    task_widget = WeekTaskWidget(task)
-                    task_widget.setParent(container)
+                    task_widget = self._create_task_widget(task, container)
                     
                     # 设置位置和大小
                     task_widget.setGeometry(int(x_pos), int(start_y), int(task_width - 5), int(height))
-                    
-                    # 添加上下文菜单
-                    task_widget.setContextMenuPolicy(Qt.CustomContextMenu)
-                    task_widget.customContextMenuRequested.connect(
-                        lambda pos, t=task: self.show_task_context_menu(pos, t)
-                    )
-                    
-                    # 连接点击事件
-                    task_widget.clicked.connect(lambda t=task: self.edit_task(t))
-                    
                     task_widget.show()
-            
-            # 调用原始的事件处理函数
-            QWidget.resizeEvent(container, event)
         except Exception as e:
             print(f"调整任务容器大小时出错: {e}")
     
@@ -1576,25 +1601,19 @@ class CalendarView(ScrollArea):
         else:
             menu.exec_(self.mapToGlobal(position))
     
-    def add_task_on_date(self, date):
-        """在指定日期添加新任务"""
-        # 设置合理的开始结束时间
-        start_datetime = datetime.combine(date.toPyDate(), datetime.min.time().replace(hour=9))
-        end_datetime = datetime.combine(date.toPyDate(), datetime.min.time().replace(hour=10))
-        
-        # 创建任务数据
+    def _open_task_dialog_for(self, start_datetime, end_datetime):
+        """以给定起止时间打开新建任务对话框
+
+        Returns:
+            bool: 用户保存了任务时返回True
+        """
         task_data = {
+            **self._DEFAULT_TASK_TEMPLATE,
             "id": None,  # 新任务，ID为空
-            "title": "",
-            "description": "",
             "start_time": start_datetime,
             "end_time": end_datetime,
-            "priority": "中",
-            "status": "未开始",
-            "completed": False
         }
         
-        # 打开任务编辑对话框
         try:
             dialog = TaskDialog(
                 self.window(), 
@@ -1606,24 +1625,30 @@ class CalendarView(ScrollArea):
             if dialog.exec_():
                 # 刷新视图
                 self.refresh()
+                return True
         except Exception as e:
-            print(f"添加任务时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("添加任务时出错")
             
-            InfoBar.error(
-                title="错误",
-                content=f"添加任务时出错: {e}",
-                parent=self.window(),
-                position=InfoBarPosition.TOP_RIGHT,
-                duration=3000
+            self._toast_error(
+                "错误", f"添加任务时出错: {e}", duration=3000,
+                parent=self.window(), position=InfoBarPosition.TOP_RIGHT
             )
+        return False
+    
+    def add_task_on_date(self, date):
+        """在指定日期添加新任务"""
+        # 设置合理的开始结束时间
+        start_datetime = datetime.combine(date.toPyDate(), datetime.min.time().replace(hour=9))
+        end_datetime = datetime.combine(date.toPyDate(), datetime.min.time().replace(hour=10))
+        
+        # 打开任务编辑对话框
+        self._open_task_dialog_for(start_datetime, end_datetime)
     
     def view_specific_day(self, date):
         """查看特定日期的日视图"""
         # 设置当前日期并切换到日视图
         self.current_date = date
-        self.view_combo.setCurrentText("日视图")
+        self.view_combo.setCurrentIndex(ViewType.DAY)
     
     def show_time_slot_context_menu(self, position, datetime_val):
         """显示时间槽上下文菜单（在日视图中）"""
@@ -1650,79 +1675,40 @@ class CalendarView(ScrollArea):
         # 创建任务数据，设置结束时间为开始时间后一小时
         end_datetime = start_datetime + timedelta(hours=1)
         
-        # 创建任务数据
-        task_data = {
-            "id": None,  # 新任务，ID为空
-            "title": "",
-            "description": "",
-            "start_time": start_datetime,
-            "end_time": end_datetime,
-            "priority": "中",
-            "status": "未开始",
-            "completed": False
-        }
-        
         # 打开任务编辑对话框
-        try:
-            dialog = TaskDialog(
-                self.window(), 
-                self.scheduler_manager,
-                self.window().config_manager,
-                self.window().subtask_manager,
-                task_data
-            )
-            if dialog.exec_():
-                # 刷新视图
-                self.refresh()
-                
-                # 显示成功消息
-                InfoBar.success(
-                    title="成功",
-                    content="任务已更新",
-                    parent=self.window(),
-                    position=InfoBarPosition.TOP_RIGHT,
-                    duration=2000
-                )
-        except Exception as e:
-            print(f"编辑任务时出错: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            InfoBar.error(
-                title="错误",
-                content=f"编辑任务时出错: {e}",
-                parent=self.window(),
-                position=InfoBarPosition.TOP_RIGHT,
-                duration=3000
+        if self._open_task_dialog_for(start_datetime, end_datetime):
+            # 显示成功消息
+            self._toast_success(
+                "成功", "任务已更新", duration=2000,
+                parent=self.window(), position=InfoBarPosition.TOP_RIGHT
             )
     
     def on_view_changed(self, index):
         """视图切换事件处理"""
+        # 记录当前视图类型，其他方法直接读取该值
+        self._current_view = index
+        
         if self.is_updating:
             return
             
         # 获取当前选择的视图类型
-        view_type = self.view_combo.currentText()
+        view_type = self._current_view
         
         # 更新导航按钮
         self.update_navigation_buttons()
         
-        # 管理星期标签行的可见性
-        for i in range(self.week_layout.count()):
-            item = self.week_layout.itemAt(i)
-            if item and item.widget():
-                # 只在月视图中显示星期标签
-                item.widget().setVisible(view_type == "月视图")
+        # 只在月视图中显示星期标签
+        self._set_week_header_visible(view_type == ViewType.MONTH)
         
-        if view_type == "月视图":
+        if view_type == ViewType.MONTH:
             self.load_month_tasks()
-        elif view_type == "周视图":
+        elif view_type == ViewType.WEEK:
             # 计算本周的起始日期（周一）
-            current_monday = self.get_monday_of_week(self.current_date)
+            current_monday = self._current_monday()
             
             # 创建周视图
             self.create_week_view(current_monday)
-        elif view_type == "日视图":
+        elif view_type == ViewType.DAY:
             # 创建日视图
             self.create_day_view(self.current_date)
     
@@ -1733,25 +1719,19 @@ class CalendarView(ScrollArea):
             self.scheduler_manager.auto_update_task_status()
             
             # 根据当前视图刷新
-            view_type = self.view_combo.currentText()
+            view_type = self._current_view
             
-            if view_type == "月视图":
+            if view_type == ViewType.MONTH:
                 self.load_month_tasks()
-            elif view_type == "周视图":
+            elif view_type == ViewType.WEEK:
                 # 计算当前周的起始日期（周一）
-                days_to_monday = self.current_date.dayOfWeek() - 1
-                if days_to_monday < 0:  # 如果是周日
-                    days_to_monday = 6
-                monday = self.current_date.addDays(-days_to_monday)
-                self.create_week_view(monday)
-            elif view_type == "日视图":
+                self.create_week_view(self._current_monday())
+            elif view_type == ViewType.DAY:
                 self.create_day_view(self.current_date)
                 
-            print(f"日历视图已刷新: {view_type}")
+            print(f"日历视图已刷新: {ViewType.NAMES[view_type]}")
         except Exception as e:
-            print(f"刷新视图时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("刷新视图时出错")
 
     def show_context_menu(self, position):
         """显示上下文菜单"""
@@ -1775,16 +1755,16 @@ class CalendarView(ScrollArea):
         menu.addAction(refresh_action)
         
         # 根据当前视图类型添加特定选项
-        view_type = self.view_combo.currentText()
-        if view_type == "月视图":
+        view_type = self._current_view
+        if view_type == ViewType.MONTH:
             # 查看本周选项
             view_week_action = Action(FluentIcon.CALENDAR, "查看本周")
-            view_week_action.triggered.connect(lambda: self.view_combo.setCurrentText("周视图"))
+            view_week_action.triggered.connect(lambda: self.view_combo.setCurrentIndex(ViewType.WEEK))
             menu.addAction(view_week_action)
-        elif view_type == "周视图" or view_type == "日视图":
+        elif view_type == ViewType.WEEK or view_type == ViewType.DAY:
             # 返回月视图选项
             view_month_action = Action(FluentIcon.CALENDAR, "返回月视图")
-            view_month_action.triggered.connect(lambda: self.view_combo.setCurrentText("月视图"))
+            view_month_action.triggered.connect(lambda: self.view_combo.setCurrentIndex(ViewType.MONTH))
             menu.addAction(view_month_action)
         
         # 显示菜单在正确位置
@@ -1795,50 +1775,15 @@ class CalendarView(ScrollArea):
             
     def add_new_task(self):
         """添加新任务"""
-        # 根据当前视图和日期创建新任务
-        view_type = self.view_combo.currentText()
+        # 根据当前日期创建新任务
         selected_date = self.current_date
         
         # 设置合理的开始结束时间
         start_datetime = datetime.combine(selected_date.toPyDate(), datetime.min.time().replace(hour=9))
         end_datetime = datetime.combine(selected_date.toPyDate(), datetime.min.time().replace(hour=10))
         
-        # 创建任务数据
-        task_data = {
-            "id": None,  # 新任务，ID为空
-            "title": "",
-            "description": "",
-            "start_time": start_datetime,
-            "end_time": end_datetime,
-            "priority": "中",
-            "status": "未开始",
-            "completed": False
-        }
-        
         # 打开任务编辑对话框
-        try:
-            dialog = TaskDialog(
-                self.window(), 
-                self.scheduler_manager,
-                self.window().config_manager,
-                self.window().subtask_manager,
-                task_data
-            )
-            if dialog.exec_():
-                # 刷新视图
-                self.refresh()
-        except Exception as e:
-            print(f"添加任务时出错: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            InfoBar.error(
-                title="错误",
-                content=f"添加任务时出错: {e}",
-                parent=self.window(),
-                position=InfoBarPosition.TOP_RIGHT,
-                duration=3000
-            )
+        self._open_task_dialog_for(start_datetime, end_datetime)
     
     def show_task_context_menu(self, position, task):
         """显示任务上下文菜单"""
@@ -1937,6 +1882,36 @@ class CalendarView(ScrollArea):
         else:
             menu.exec_(self.mapToGlobal(position))
             
+    def _show_info_bar(self, show_func, title, content, duration=2000,
+                       parent=None, position=InfoBarPosition.TOP):
+        """在下一轮事件循环中显示提示条，避免阻塞菜单关闭和视图刷新"""
+        def show():
+            try:
+                # 视图已隐藏或正在销毁时不再显示
+                if not self.isVisible():
+                    return
+                show_func(
+                    title=title,
+                    content=content,
+                    orient=Qt.Horizontal,
+                    isClosable=True,
+                    position=position,
+                    duration=duration,
+                    parent=parent if parent is not None else self
+                )
+            except Exception:
+                logger.exception("显示InfoBar时出错")
+
+        QTimer.singleShot(0, show)
+
+    def _toast_success(self, title, content, **kwargs):
+        """延迟显示成功提示"""
+        self._show_info_bar(InfoBar.success, title, content, **kwargs)
+
+    def _toast_error(self, title, content, **kwargs):
+        """延迟显示错误提示"""
+        self._show_info_bar(InfoBar.error, title, content, **kwargs)
+
     def quick_change_task_completion(self, task, completed):
         """快速更改任务完成状态"""
         # 复制任务数据并修改完成状态
@@ -1951,34 +1926,12 @@ class CalendarView(ScrollArea):
         if self.scheduler_manager.update_task(updated_task):
             # 显示成功消息
             completion_status = "已完成" if completed else "未完成"
-            try:
-                InfoBar.success(
-                    title="已更新",
-                    content=f"任务已标记为{completion_status}",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_success("已更新", f"任务已标记为{completion_status}")
             # 刷新视图
             self.refresh()
         else:
             # 显示错误消息
-            try:
-                InfoBar.error(
-                    title="更新失败",
-                    content="无法更新任务状态，请稍后重试",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_error("更新失败", "无法更新任务状态，请稍后重试")
             
     def quick_change_status(self, task, status):
         """快速修改任务状态"""
@@ -2003,34 +1956,12 @@ class CalendarView(ScrollArea):
         # 更新任务
         if self.scheduler_manager.update_task(updated_task):
             # 显示成功消息
-            try:
-                InfoBar.success(
-                    title="已更新",
-                    content=f"任务状态已设置为 {status}",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_success("已更新", f"任务状态已设置为 {status}")
             # 刷新视图
             self.refresh()
         else:
             # 显示错误消息
-            try:
-                InfoBar.error(
-                    title="更新失败",
-                    content="无法更新任务状态，请稍后重试",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_error("更新失败", "无法更新任务状态，请稍后重试")
                 
     def quick_change_priority(self, task, priority):
         """快速修改任务优先级"""
@@ -2041,34 +1972,12 @@ class CalendarView(ScrollArea):
         # 更新任务
         if self.scheduler_manager.update_task(updated_task):
             # 显示成功消息
-            try:
-                InfoBar.success(
-                    title="已更新",
-                    content=f"任务优先级已设置为 {priority}",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_success("已更新", f"任务优先级已设置为 {priority}")
             # 刷新视图
             self.refresh()
         else:
             # 显示错误消息
-            try:
-                InfoBar.error(
-                    title="更新失败",
-                    content="无法更新任务优先级，请稍后重试",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_error("更新失败", "无法更新任务优先级，请稍后重试")
     
     def delete_task(self, task):
         """删除任务"""
@@ -2084,34 +1993,12 @@ class CalendarView(ScrollArea):
         # 删除任务
         if self.scheduler_manager.delete_task(task["id"]):
             # 显示成功消息
-            try:
-                InfoBar.success(
-                    title="已删除",
-                    content="任务已成功删除",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_success("已删除", "任务已成功删除")
             # 刷新视图
             self.refresh()
         else:
             # 显示错误消息
-            try:
-                InfoBar.error(
-                    title="删除失败",
-                    content="无法删除任务，请稍后重试",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_error("删除失败", "无法删除任务，请稍后重试")
 
     def edit_task(self, task_data):
         """编辑任务"""
@@ -2130,29 +2017,61 @@ class CalendarView(ScrollArea):
                 # 刷新视图
                 self.refresh()
         except Exception as e:
-            print(f"编辑任务时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("编辑任务时出错")
             
             # 显示错误消息
-            try:
-                InfoBar.error(
-                    title="编辑失败",
-                    content=f"编辑任务时出错: {e}",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=3000,
-                    parent=self
-                )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            self._toast_error("编辑失败", f"编辑任务时出错: {e}", duration=3000)
             
+class TaskContainer(QWidget):
+    """周/日视图中承载任务小部件的容器
+
+    宽度发生明显变化时回调视图重新排布任务，高度变化或亚像素级抖动直接忽略
+    """
+    
+    # 宽度变化小于该阈值（像素）时不重新布局
+    RELAYOUT_THRESHOLD = 4
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._relayout_handler = None
+        self._last_layout_width = -1
+    
+    def set_relayout_handler(self, handler):
+        """设置重新布局回调，回调参数为容器本身"""
+        self._relayout_handler = handler
+    
+    def resizeEvent(self, event):
+        """大小变化时按需触发重新布局"""
+        super().resizeEvent(event)
+        
+        if self._relayout_handler is None or event.size() == event.oldSize():
+            return
+        
+        new_width = event.size().width()
+        if abs(new_width - self._last_layout_width) < self.RELAYOUT_THRESHOLD:
+            return
+        
+        self._last_layout_width = new_width
+        self._relayout_handler(self)
+
 class WeekTaskWidget(QWidget):
     """周视图中的任务小部件"""
     
     clicked = pyqtSignal(dict)  # 点击任务时发出信号，包含任务数据
     
+    # 各字号下"HH:MM"时间文本的宽度，首次使用时计算
+    # 该字体中数字等宽，用"00:00"的宽度即可代表所有时间
+    _TIME_WIDTH_BY_FONTSIZE = {}
+    
+    @classmethod
+    def _time_width(cls, font_size):
+        """获取指定字号下时间文本的宽度"""
+        width = cls._TIME_WIDTH_BY_FONTSIZE.get(font_size)
+        if width is None:
+            width = math.ceil(font_metrics(yahei(font_size)).horizontalAdvance("00:00"))
+            cls._TIME_WIDTH_BY_FONTSIZE[font_size] = width
+        return width
+    
     def __init__(self, task_data, parent=None):
         super().__init__(parent)
         self.task_data = task_data
@@ -2197,6 +2116,10 @@ class WeekTaskWidget(QWidget):
         self.setMouseTracking(True)
         self.is_hovered = False
         
+        # 背景完全由paintEvent绘制，无需系统预先填充背景
+        # 注意：圆角外侧是透明的，因此不能设置WA_OpaquePaintEvent
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        
         # 显示tooltip
         self.update_tooltip()
     
@@ -2228,6 +2151,11 @@ class WeekTaskWidget(QWidget):
     
     def paintEvent(self, event):
         """绘制任务小部件"""
+        # 重绘区域不与实际绘制内容相交时（例如滚动时仅露出右侧1像素边距）直接跳过
+        # 左侧边框占满整个高度，右侧最后一列像素不绘制内容
+        if not event.rect().intersects(self.rect().adjusted(0, 0, -1, 0)):
+            return
+        
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
@@ -2237,41 +2165,8 @@ class WeekTaskWidget(QWidget):
         end_time = self.task_data.get("end_time")
         status = self.task_data.get("status", "未开始")
         
-        # 定义绘制区域
-        rect = self.rect().adjusted(1, 1, -1, -1)  # 缩小1像素，留出边距
-        
-        # 绘制背景和边框
-        if self.is_hovered:
-            # 悬停时背景更明亮
-            bg_color = self.bg_color.lighter(105)
-            border_color = self.border_color.darker(110)
-            shadow_color = QColor(0, 0, 0, 40)
-            
-            # 绘制轻微阴影效果
-            shadow_rect = rect.adjusted(2, 2, 2, 2)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QBrush(shadow_color))
-            painter.drawRoundedRect(shadow_rect, 3, 3)
-        else:
-            bg_color = self.bg_color
-            border_color = self.border_color
-        
-        # 绘制背景
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(bg_color))
-        painter.drawRoundedRect(rect, 3, 3)
-        
-        # 绘制左侧边框
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(border_color))
-        painter.drawRect(0, 0, 3, self.height())
-        
-        # 如果是暂停状态，绘制虚线边框
-        if status == "已暂停":
-            pen = QPen(border_color, 1, Qt.DashLine)
-            painter.setPen(pen)
-            painter.setBrush(Qt.NoBrush)
-            painter.drawRoundedRect(rect, 3, 3)
+        # 绘制背景和边框（相同尺寸/优先级/状态/悬停状态的小部件共享同一缓存位图）
+        painter.drawPixmap(0, 0, self._background_pixmap(status))
         
         # 文本区域（留出左侧边框和右侧边距）
         text_rect = QRect(6, 0, self.width() - 8, self.height())
@@ -2291,17 +2186,14 @@ class WeekTaskWidget(QWidget):
         # 基于高度选择显示内容
         if self.height() >= 50:  # 高度足够显示完整信息
             # 画标题
-            title_font = QFont("Microsoft YaHei", font_size + 1)
-            title_font.setBold(True)
-            painter.setFont(title_font)
+            painter.setFont(yahei(font_size + 1, bold=True))
             
             title_rect = QRect(6, 3, self.width() - 10, 20)
             elided_title = painter.fontMetrics().elidedText(title, Qt.ElideRight, title_rect.width())
             painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignTop, elided_title)
             
             # 画时间
-            time_font = QFont("Microsoft YaHei", font_size)
-            painter.setFont(time_font)
+            painter.setFont(yahei(font_size))
             
             time_text = f"{start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}"
             time_rect = QRect(6, title_rect.bottom(), self.width() - 10, 20)
@@ -2310,8 +2202,7 @@ class WeekTaskWidget(QWidget):
             # 如果有描述且高度足够，显示部分描述
             description = self.task_data.get("description", "")
             if description and self.height() >= 70:
-                desc_font = QFont("Microsoft YaHei", font_size)
-                painter.setFont(desc_font)
+                painter.setFont(yahei(font_size))
                 
                 desc_rect = QRect(6, time_rect.bottom(), self.width() - 10, self.height() - title_rect.height() - time_rect.height() - 5)
                 # 截断过长的描述
@@ -2324,13 +2215,13 @@ class WeekTaskWidget(QWidget):
                 
         elif self.height() >= 30:  # 中等高度，只显示标题和时间
             # 使用适应宽度的字体
-            painter.setFont(QFont("Microsoft YaHei", font_size))
+            painter.setFont(yahei(font_size))
             
             # 显示开始时间和标题
             time_text = start_time.strftime('%H:%M')
             
             # 检查宽度是否足够显示时间和标题
-            time_width = painter.fontMetrics().width(time_text)
+            time_width = self._time_width(font_size)
             
             # 添加暂停状态指示
             prefix = ""
@@ -2349,11 +2240,11 @@ class WeekTaskWidget(QWidget):
             
         else:  # 最小高度，优先显示时间
             # 使用最小字体
-            painter.setFont(QFont("Microsoft YaHei", font_size))
+            painter.setFont(yahei(font_size))
             
             # 仅显示开始时间，如果空间允许则显示部分标题
             time_text = start_time.strftime('%H:%M')
-            time_width = painter.fontMetrics().width(time_text)
+            time_width = self._time_width(font_size)
             
             # 添加暂停状态指示
             prefix = ""
@@ -2370,6 +2261,65 @@ class WeekTaskWidget(QWidget):
                 
             painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, display_text)
     
+    def _background_pixmap(self, status):
+        """获取背景位图，未命中QPixmapCache时渲染并写入缓存"""
+        dpr = self.devicePixelRatioF()
+        key = (
+            f"wt_{self.width()}_{self.height()}_{dpr}_"
+            f"{self.task_data.get('priority', '中')}_{status}_{int(self.is_hovered)}"
+        )
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap(self.size() * dpr)
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            
+            pixmap_painter = QPainter(pixmap)
+            pixmap_painter.setRenderHint(QPainter.Antialiasing)
+            self._paint_background(pixmap_painter, status)
+            pixmap_painter.end()
+            
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+    
+    def _paint_background(self, painter, status):
+        """绘制背景、左侧边框及暂停状态的虚线边框"""
+        # 定义绘制区域
+        rect = self.rect().adjusted(1, 1, -1, -1)  # 缩小1像素，留出边距
+        
+        # 绘制背景和边框
+        if self.is_hovered:
+            # 悬停时背景更明亮
+            bg_color = self.bg_color.lighter(105)
+            border_color = self.border_color.darker(110)
+            shadow_color = QColor(0, 0, 0, 40)
+            
+            # 绘制轻微阴影效果
+            shadow_rect = rect.adjusted(2, 2, 2, 2)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(shadow_color))
+            painter.drawRoundedRect(shadow_rect, 3, 3)
+        else:
+            bg_color = self.bg_color
+            border_color = self.border_color
+        
+        # 绘制背景
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(bg_color))
+        painter.drawRoundedRect(rect, 3, 3)
+        
+        # 绘制左侧边框
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(border_color))
+        painter.drawRect(0, 0, 3, self.height())
+        
+        # 如果是暂停状态，绘制虚线边框
+        if status == "已暂停":
+            pen = QPen(border_color, 1, Qt.DashLine)
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(rect, 3, 3)
+    
     def enterEvent(self, event):
         """鼠标进入事件"""
         self.is_hovered = True
@@ -2394,6 +2344,32 @@ class WeekTaskWidget(QWidget):
 class WeekDayHeader(QWidget):
     """周视图中的日期标题栏"""
     
+    # 绘制用的画笔和字体，所有标题共享，避免每次重绘重新创建
+    TODAY_BORDER_PEN = QPen(_COL_TODAY_BORDER, 2)
+    WEEKEND_BORDER_PEN = QPen(_COL_WEEKEND_BORDER, 1)
+    NORMAL_BORDER_PEN = QPen(_COL_GREY, 1)
+    TODAY_WEEKDAY_PEN = QPen(_COL_BLUE)
+    WEEKEND_WEEKDAY_PEN = QPen(_COL_RED)
+    NORMAL_WEEKDAY_PEN = QPen(_COL_DARK)
+    FONT_BOLD = YAHEI_9_BOLD
+    FONT_NORMAL = YAHEI_9
+    FONT_SMALL = YAHEI_8
+    
+    # (今天的日期, 缓存时的单调时钟) ，同一次周视图重建中的7个标题共享
+    _today_cache = (None, 0.0)
+    # 今天日期缓存的有效期（秒）
+    TODAY_CACHE_TTL = 60
+    
+    @classmethod
+    def _today(cls):
+        """获取今天的日期，在有效期内复用缓存值"""
+        now_ts = time.monotonic()
+        today, cached_ts = cls._today_cache
+        if today is None or now_ts - cached_ts > cls.TODAY_CACHE_TTL:
+            today = datetime.now().date()
+            cls._today_cache = (today, now_ts)
+        return today
+    
     def __init__(self, date, parent=None):
         super().__init__(parent)
         self.date = date
@@ -2401,116 +2377,245 @@ class WeekDayHeader(QWidget):
         # 移除固定宽度设置，允许自适应
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         
-        # 设置基础背景色
-        self.bg_color = QColor(245, 245, 245)
-        self.is_today = False
-        self.is_weekend = False
+        # 周六或周日
+        self.is_weekend = self.date.dayOfWeek() > 5
+        self.is_today = None
         
-        # 检查是否是今天
-        today = datetime.now().date()
-        if self.date.toPyDate() == today:
-            self.bg_color = QColor(220, 237, 255)  # 更明显的今天高亮
-            self.is_today = True
-            
-        # 周末使用略微不同的背景色
-        if self.date.dayOfWeek() > 5:  # 周六或周日
-            self.bg_color = QColor(252, 245, 245) if not self.is_today else self.bg_color
-            self.is_weekend = True
+        # 星期和日期文本在构造时确定并预先排版，重绘时无需再次计算字形布局
+        self._weekday_text = _WEEKDAY_NAMES[self.date.dayOfWeek() - 1]
+        self._date_text = self.date.toString("MM-dd")
+        self._weekday_static = QStaticText(self._weekday_text)
+        self._date_static = QStaticText(self._date_text)
+        self._date_static.prepare(QTransform(), self.FONT_SMALL)
+        
+        # 渲染结果缓存，大小或状态变化时失效
+        self._cache = None
+        
+        # 检查是否是今天，并据此设置背景色和星期文本样式
+        self.set_today(self.date.toPyDate() == self._today())
+        
+        # 标题总是完整绘制自身区域，无需Qt预先绘制父部件背景
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+    
+    def set_today(self, is_today):
+        """设置是否为今天，仅在状态变化时更新样式并重绘
+
+        由日历视图在跨越午夜时调用，其余时间is_today保持不变
+        """
+        if is_today == self.is_today:
+            return
+        self.is_today = is_today
+        
+        if is_today:
+            self.bg_color = _COL_TODAY_BG  # 更明显的今天高亮
+        elif self.is_weekend:
+            self.bg_color = _COL_WEEKEND_BG  # 周末使用略微不同的背景色
+        else:
+            self.bg_color = _COL_HEADER_BG
+        self._bg_brush = QBrush(self.bg_color)
+        
+        # 今天的星期文本使用粗体，需要重新排版
+        self._weekday_static.prepare(QTransform(), self.FONT_BOLD if is_today else self.FONT_NORMAL)
+        
+        # 文本绘制区域，仅在大小或状态变化时更新
+        self._update_text_rects()
+        self.invalidate_cache()
+    
+    def _update_text_rects(self):
+        """根据当前宽度计算星期和日期的绘制区域及居中后的文本位置"""
+        self._weekday_rect = QRect(0, 2, self.width(), 15)
+        self._date_rect = QRect(0, 16, self.width(), 14)
+        self._weekday_pos = self._centered_pos(self._weekday_static, self._weekday_rect)
+        self._date_pos = self._centered_pos(self._date_static, self._date_rect)
+    
+    @staticmethod
+    def _centered_pos(static_text, rect):
+        """计算静态文本在指定区域内居中时的左上角位置"""
+        text_size = static_text.size()
+        return QPointF(
+            rect.x() + (rect.width() - text_size.width()) / 2,
+            rect.y() + (rect.height() - text_size.height()) / 2
+        )
+    
+    def resizeEvent(self, event):
+        """大小变化时更新文本绘制区域并使缓存失效"""
+        super().resizeEvent(event)
+        self._update_text_rects()
+        self.invalidate_cache()
+    
+    def invalidate_cache(self):
+        """使渲染缓存失效并请求重绘"""
+        self._cache = None
+        self.update()
+    
+    def _render_cache(self):
+        """将标题内容渲染到缓存位图中"""
+        dpr = self.devicePixelRatioF()
+        self._cache = QPixmap(self.size() * dpr)
+        self._cache.setDevicePixelRatio(dpr)
+        self._cache.fill(Qt.transparent)
+        
+        painter = QPainter(self._cache)
+        self._paint_content(painter)
+        painter.end()
     
     def paintEvent(self, event):
-        """绘制日期标题"""
+        """绘制日期标题，内容不变时直接复用缓存位图"""
+        # 窗口移动到设备像素比不同的屏幕时也需要重新渲染
+        if self._cache is None or self._cache.devicePixelRatioF() != self.devicePixelRatioF():
+            self._render_cache()
+        
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        # 只复制需要重绘的区域
+        painter.setClipRect(event.rect())
+        painter.drawPixmap(0, 0, self._cache)
+    
+    def _paint_content(self, painter):
+        """绘制背景、底部边框以及星期和日期文本"""
+        w = self.width()
+        bottom = self.height() - 1
         
-        # 绘制背景
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(self.bg_color))
-        painter.drawRect(self.rect())
+        # 绘制背景，fillRect不依赖画笔和画刷状态
+        painter.fillRect(self.rect(), self._bg_brush)
         
         # 绘制底部边框，周末或今天使用特殊颜色
         if self.is_today:
-            border_color = QColor(100, 181, 246)  # 蓝色边框
-            border_width = 2
+            border_pen = self.TODAY_BORDER_PEN
         elif self.is_weekend:
-            border_color = QColor(239, 154, 154)  # 淡红色边框
-            border_width = 1
+            border_pen = self.WEEKEND_BORDER_PEN
         else:
-            border_color = QColor(200, 200, 200)
-            border_width = 1
+            border_pen = self.NORMAL_BORDER_PEN
             
-        painter.setPen(QPen(border_color, border_width))
-        painter.drawLine(0, self.height() - 1, self.width(), self.height() - 1)
-        
-        # 获取日期信息
-        weekday = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"][self.date.dayOfWeek() - 1]
-        date_str = self.date.toString("MM-dd")
+        painter.setPen(border_pen)
+        painter.drawLine(0, bottom, w, bottom)
         
-        # 使用不同颜色绘制周末
-        if self.is_weekend:
-            weekday_color = QColor(239, 83, 80)  # 红色
-        else:
-            weekday_color = QColor(33, 33, 33)
-            
-        # 今天使用蓝色
+        # 今天使用蓝色粗体，周末使用特殊颜色
         if self.is_today:
-            weekday_color = QColor(33, 150, 243)  # 蓝色
+            weekday_pen = self.TODAY_WEEKDAY_PEN
+            weekday_font = self.FONT_BOLD
+        elif self.is_weekend:
+            weekday_pen = self.WEEKEND_WEEKDAY_PEN
+            weekday_font = self.FONT_NORMAL
+        else:
+            weekday_pen = self.NORMAL_WEEKDAY_PEN
+            weekday_font = self.FONT_NORMAL
             
         # 绘制星期文本
-        painter.setPen(QPen(weekday_color))
-        painter.setFont(QFont("Microsoft YaHei", 9, QFont.Bold if self.is_today else QFont.Normal))
+        painter.setPen(weekday_pen)
+        painter.setFont(weekday_font)
         
         # 分别绘制星期和日期
-        weekday_rect = QRect(0, 2, self.width(), 15)
-        date_rect = QRect(0, 16, self.width(), 14)
-        
-        painter.drawText(weekday_rect, Qt.AlignCenter, weekday)
+        painter.drawStaticText(self._weekday_pos, self._weekday_static)
         
         # 使用稍小的字体绘制日期
-        painter.setFont(QFont("Microsoft YaHei", 8))
-        painter.drawText(date_rect, Qt.AlignCenter, date_str)
+        painter.setFont(self.FONT_SMALL)
+        painter.drawStaticText(self._date_pos, self._date_static)
 
-class HourlyLabel(QWidget):
-    """时间轴上的小时标签"""
+class TimelineAxis(QWidget):
+    """周视图左侧的时间轴，在一个部件内绘制全部24个小时刻度"""
+    
+    HOURS = 24
     
-    def __init__(self, hour, parent=None):
+    # 绘制用的画笔、画刷和字体
+    WORK_PEN = QPen(_COL_WORK)  # 工作时间文本
+    OFFWORK_PEN = QPen(_COL_OFFWORK)  # 非工作时间文本
+    EVEN_BG = QBrush(_COL_BG_EVEN)  # 偶数小时背景
+    ODD_BG = QBrush(_COL_BG_ODD)  # 奇数小时背景
+    SEP_PEN = QPen(_COL_SEP)  # 分隔线
+    HOUR_FONT = YAHEI_8
+    
+    def __init__(self, hour_height=50, parent=None):
         super().__init__(parent)
-        self.hour = hour
-        self.setFixedWidth(50)  # 增加宽度以适应更多文本
+        self.hour_height = hour_height
+        self.setFixedWidth(50)  # 宽度足以容纳时间文本
+        self.setFixedHeight(self.HOURS * hour_height)
+        
+        # 背景不透明且覆盖整个部件，无需Qt预先绘制父部件背景
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        
+        # 预先排版各小时文本，重绘时无需再次计算字形布局
+        self._static_texts = []
+        self._text_pens = []
+        for hour in range(self.HOURS):
+            static_text = QStaticText(_HOUR_STRINGS[hour])
+            static_text.prepare(QTransform(), self.HOUR_FONT)
+            self._static_texts.append(static_text)
+            # 为工作时间和非工作时间使用不同颜色
+            self._text_pens.append(self.WORK_PEN if 9 <= hour < 18 else self.OFFWORK_PEN)
+        
+        self._update_geometry()
+        
+        # 设备坐标渲染缓存，大小或设备像素比变化时失效
+        self._cache = None
+    
+    def sizeHint(self):
+        """建议尺寸"""
+        return QSize(50, self.HOURS * self.hour_height)
+    
+    def resizeEvent(self, event):
+        """大小变化时更新文本位置和分隔线，并使缓存失效"""
+        super().resizeEvent(event)
+        self._update_geometry()
+        self._cache = None
+    
+    def _update_geometry(self):
+        """计算文本位置（右对齐、垂直居中）和分隔线"""
+        width = self.width()
+        hour_height = self.hour_height
+        
+        self._text_positions = []
+        for hour, static_text in enumerate(self._static_texts):
+            text_size = static_text.size()
+            self._text_positions.append(QPointF(
+                width - 5 - text_size.width(),
+                hour * hour_height + (hour_height - text_size.height()) / 2
+            ))
+        
+        # 偶数/奇数小时的背景矩形，绘制时各用一次drawRects批量填充
+        self._even_rects = [QRect(0, hour * hour_height, width, hour_height) for hour in range(0, self.HOURS, 2)]
+        self._odd_rects = [QRect(0, hour * hour_height, width, hour_height) for hour in range(1, self.HOURS, 2)]
+        
+        # 右侧竖线以及每个小时底部的横线
+        self._separator_lines = [QLine(width - 1, 0, width - 1, self.height())]
+        for hour in range(self.HOURS):
+            bottom = (hour + 1) * hour_height - 1
+            self._separator_lines.append(QLine(0, bottom, width, bottom))
     
     def paintEvent(self, event):
-        """绘制小时标签"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 获取小时起止范围
-        start_hour_str = f"{self.hour:02d}:00"
-        end_hour_str = f"{(self.hour+1) % 24:02d}:00"
+        """绘制时间轴，内容不变时直接复制缓存位图中需要重绘的区域"""
+        dpr = self.devicePixelRatioF()
+        if self._cache is None or self._cache.devicePixelRatioF() != dpr:
+            self._cache = QPixmap(self.size() * dpr)
+            self._cache.setDevicePixelRatio(dpr)
+            cache_painter = QPainter(self._cache)
+            self._paint_content(cache_painter)
+            cache_painter.end()
         
-        # 为工作时间和非工作时间使用不同颜色
-        if 9 <= self.hour < 18:  # 工作时间
-            text_color = QColor(30, 30, 30)
-        else:  # 非工作时间
-            text_color = QColor(120, 120, 120)
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.drawPixmap(0, 0, self._cache)
+    
+    def _paint_content(self, painter):
+        """绘制全部小时行的背景、文本和分隔线"""
+        hours = range(self.HOURS)
         
-        # 绘制背景
-        # 交替使用略微不同的背景色使时间轴更易读
-        if self.hour % 2 == 0:
-            bg_color = QColor(248, 248, 248)
-        else:
-            bg_color = QColor(245, 245, 245)
-            
+        # 交替使用略微不同的背景色使时间轴更易读，同色背景批量绘制
         painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(bg_color))
-        painter.drawRect(self.rect())
-        
-        # 绘制时间文本
-        painter.setPen(QPen(text_color))
-        painter.setFont(QFont("Microsoft YaHei", 8))
-        
-        text_rect = QRect(0, 0, self.width() - 5, self.height())
-        painter.drawText(text_rect, Qt.AlignRight | Qt.AlignVCenter, start_hour_str)
+        painter.setBrush(self.EVEN_BG)
+        painter.drawRects(self._even_rects)
+        painter.setBrush(self.ODD_BG)
+        painter.drawRects(self._odd_rects)
+        
+        # 绘制时间文本，按画笔分组以减少状态切换
+        painter.setFont(self.HOUR_FONT)
+        for pen in (self.WORK_PEN, self.OFFWORK_PEN):
+            painter.setPen(pen)
+            for hour in hours:
+                if self._text_pens[hour] is pen:
+                    painter.drawStaticText(self._text_positions[hour], self._static_texts[hour])
         
-        # 绘制右侧和底部分隔线
-        painter.setPen(QPen(QColor(220, 220, 220)))
-        painter.drawLine(self.width() - 1, 0, self.width() - 1, self.height())
-        painter.drawLine(0, self.height() - 1, self.width(), self.height() - 1) 
\ No newline at end of file
+        # 一次批量绘制所有分隔线
+        painter.setPen(self.SEP_PEN)
+        painter.drawLines(self._separator_lines)
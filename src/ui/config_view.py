@@ -6,29 +6,103 @@
 用于设置应用程序的各项配置
 """
 
-from PyQt5.QtCore import Qt, pyqtSignal, QTime
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, pyqtSlot, QTime, QTimer, QSignalBlocker,
+    QObject, QRunnable, QThreadPool
+)
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QFrame, QScrollArea, QGridLayout, QTimeEdit,
-    QCheckBox, QComboBox, QSpinBox, QFileDialog,
-    QGroupBox, QPushButton
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QGridLayout, QTimeEdit, QCheckBox, QFileDialog
 )
 from PyQt5.QtGui import QColor
 
 from qfluentwidgets import (
     ScrollArea, FluentIcon, PushButton, ColorPickerButton,
-    ToggleButton, BodyLabel, CardWidget, MessageBox,
+    BodyLabel, CardWidget, MessageBox,
     SubtitleLabel, LineEdit, SearchLineEdit, SwitchButton,
     TitleLabel, InfoBar, InfoBarPosition, ComboBox,
     SpinBox, PrimaryPushButton, TransparentToolButton,
-    Theme, setTheme, isDarkTheme, MessageBoxBase, 
-    setThemeColor, ToolTipFilter, ToolTipPosition
+    Theme, setTheme, setThemeColor, Dialog
 )
 
-import json
 import os
+import copy
+import json
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dump_config_json(data):
+    """将配置序列化为UTF-8编码的JSON字节串，优先使用orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _load_config_json(data):
+    """从UTF-8编码的JSON字节串解析配置，优先使用orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+# 下拉框索引与配置值的对应关系，索引即下拉框选项的位置
+_THEME_CODES = ("light", "dark", "auto")
+_THEME_INDEX = {code: i for i, code in enumerate(_THEME_CODES)}
+_VIEW_CODES = ("calendar", "gantt", "flow")
+_VIEW_INDEX = {code: i for i, code in enumerate(_VIEW_CODES)}
+_LANG_CODES = ("zh_CN", "en_US")
+_LANG_INDEX = {code: i for i, code in enumerate(_LANG_CODES)}
+
+# 恢复备份时文件选择对话框的默认目录
+BACKUP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'backups')
+
+
+def _parse_hhmm(text, default):
+    """将"HH:mm"格式的字符串解析为QTime，格式不正确时使用默认值"""
+    try:
+        hour, minute = text.split(":")
+        time = QTime(int(hour), int(minute))
+    except (AttributeError, ValueError):
+        time = QTime()
+    return time if time.isValid() else QTime.fromString(default, "HH:mm")
+
+
+class _JsonWorkerSignals(QObject):
+    """后台JSON任务的信号"""
+    
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class _JsonWorker(QRunnable):
+    """在线程池中执行配置文件读写和JSON编解码的任务"""
+    
+    def __init__(self, func):
+        """
+        初始化任务
+        
+        Args:
+            func: 在后台线程执行的无参函数，其返回值通过finished信号发出
+        """
+        super().__init__()
+        self.func = func
+        self.signals = _JsonWorkerSignals()
+    
+    def run(self):
+        """执行任务"""
+        try:
+            result = self.func()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
 # 基本设置卡片
 class SettingCard(CardWidget):
     """基本设置卡片"""
@@ -66,10 +140,15 @@ class SettingCard(CardWidget):
         self.titleLabel = SubtitleLabel(title, self)
         self.infoLayout.addWidget(self.titleLabel)
         
-        # 内容
-        if content:
-            self.contentLabel = BodyLabel(content, self)
-            self.infoLayout.addWidget(self.contentLabel)
+        # 内容，没有内容时隐藏
+        self.contentLabel = BodyLabel(content or "", self)
+        self.infoLayout.addWidget(self.contentLabel)
+        if not content:
+            self.contentLabel.hide()
+        
+        # 小写的标题和内容，供搜索直接比较
+        self.title_lc = str(title).lower()
+        self.content_lc = (content or "").lower()
             
         self.hBoxLayout.addLayout(self.infoLayout)
         self.hBoxLayout.addStretch(1)
@@ -77,6 +156,7 @@ class SettingCard(CardWidget):
     def setTitle(self, title):
         """设置标题"""
         self.titleLabel.setText(title)
+        self.title_lc = str(title).lower()
     
     def title(self):
         """获取标题"""
@@ -84,17 +164,13 @@ class SettingCard(CardWidget):
     
     def setContent(self, content):
         """设置内容"""
-        if hasattr(self, 'contentLabel'):
-            self.contentLabel.setText(content)
-        else:
-            self.contentLabel = BodyLabel(content, self)
-            self.infoLayout.addWidget(self.contentLabel)
+        self.contentLabel.setText(content)
+        self.contentLabel.setVisible(bool(content))
+        self.content_lc = (content or "").lower()
     
     def content(self):
         """获取内容"""
-        if hasattr(self, 'contentLabel'):
-            return self.contentLabel.text()
-        return ""
+        return self.contentLabel.text()
         
 # 开关设置卡片
 class SwitchSettingCard(SettingCard):
@@ -187,18 +263,32 @@ class ColorSettingCard(SettingCard):
         super().__init__(icon, title, content, parent)
         
         # 添加颜色选择按钮
-        self.colorButton = ColorPickerButton(QColor(0, 120, 212), str(title), self)
+        color = QColor(0, 120, 212)
+        self.colorButton = ColorPickerButton(color, str(title), self)
+        self.colorButton.colorChanged.connect(self._on_color_changed)
         self.colorButton.colorChanged.connect(self.colorChanged)
         self.hBoxLayout.addWidget(self.colorButton, 0, Qt.AlignRight)
         self.hBoxLayout.addSpacing(16)
+        
+        # 当前颜色的RGB整数值，保存时才格式化为十六进制文本
+        self._rgb_cache = color.rgb()
+    
+    def _on_color_changed(self, color):
+        """颜色选择变化时更新缓存"""
+        self._rgb_cache = color.rgb()
     
     def setColor(self, color):
         """设置颜色"""
         self.colorButton.setColor(color)
+        self._rgb_cache = QColor(color).rgb()
     
     def color(self):
         """获取颜色"""
         return self.colorButton.color()
+    
+    def rgb_hex(self):
+        """获取颜色的"#rrggbb"文本"""
+        return '#%06x' % (self._rgb_cache & 0xFFFFFF)
         
     def title(self):
         """获取标题文本"""
@@ -206,10 +296,9 @@ class ColorSettingCard(SettingCard):
         
     def setTitle(self, title):
         """设置标题文本"""
-        self.titleLabel.setText(title)
-        # 更新ColorPickerButton的title
-        if hasattr(self, 'colorButton'):
-            self.colorButton.title = str(title)
+        super().setTitle(title)
+        # 更新ColorPickerButton的title，colorButton在初始化时创建，始终存在
+        self.colorButton.title = str(title)
 
 # 输入框设置卡片
 class LineEditSettingCard(SettingCard):
@@ -288,10 +377,18 @@ class SettingCardGroup(QWidget):
         self.contentLayout.setSpacing(2)
         
         self.vBoxLayout.addLayout(self.contentLayout)
+        
+        # 已添加的设置卡片，按添加顺序排列
+        self._cards = []
     
     def addSettingCard(self, card):
         """添加设置卡片"""
         self.contentLayout.addWidget(card)
+        self._cards.append(card)
+    
+    def cards(self):
+        """获取已添加的设置卡片"""
+        return self._cards
     
     def title(self):
         """获取标题"""
@@ -308,6 +405,13 @@ class SettingCardGroup(QWidget):
 class ConfigView(ScrollArea):
     """配置视图"""
     
+    # 未构建设置组的占位高度估算值
+    GROUP_HEADER_HEIGHT = 70
+    CARD_HEIGHT = 80
+    
+    # 搜索防抖延迟(毫秒)
+    SEARCH_DELAY = 150
+    
     def __init__(self, config_manager, parent=None):
         """
         初始化配置视图
@@ -323,6 +427,21 @@ class ConfigView(ScrollArea):
         self.setObjectName("configView")
         self.setWidgetResizable(True)
         
+        # 未构建的设置组 -> (构建函数, 加载函数)
+        self._group_builders = {}
+        # 已构建的设置组 -> 加载函数
+        self._group_handlers = {}
+        # 配置键 -> 从控件读取配置值的函数
+        self._field_getters = {}
+        # 已修改但未保存的配置键 -> 所属部分("user"或"system")
+        self._dirty = {}
+        # 上次应用的(主题模式索引, 主题色)，用于跳过重复应用
+        self._applied_theme = None
+        
+        # 搜索索引: [(设置组, 设置卡片)]，构建新的设置组后需重建
+        self._search_index = None
+        self._group_title_lc = {}
+        
         # 初始化界面
         self.init_ui()
         
@@ -353,7 +472,12 @@ class ConfigView(ScrollArea):
         self.search_edit = SearchLineEdit(self)
         self.search_edit.setPlaceholderText("搜索设置...")
         self.search_edit.setFixedWidth(200)
-        self.search_edit.textChanged.connect(self.search_config)
+        # 输入停止一段时间后再搜索，避免每次按键都重新筛选
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY)
+        self._search_timer.timeout.connect(lambda: self.search_config(self.search_edit.text()))
+        self.search_edit.textChanged.connect(self._search_timer.start)
         header_layout.addWidget(self.search_edit)
         
         # 操作按钮
@@ -374,9 +498,140 @@ class ConfigView(ScrollArea):
         
         self.main_layout.addLayout(header_layout)
         
-        # ================ 外观设置 ================
-        self.appearance_group = SettingCardGroup("外观设置", self.main_widget)
+        # 设置组先以空组占位，滚动到可见区域时再创建其中的设置卡片
+        self.appearance_group = self._add_lazy_group(
+            "外观设置", 5,
+            self._build_appearance_group, self._load_appearance_settings
+        )
+        self.view_group = self._add_lazy_group(
+            "视图设置", 4,
+            self._build_view_group, self._load_view_settings
+        )
+        self.work_group = self._add_lazy_group(
+            "工作设置", 3,
+            self._build_work_group, self._load_work_settings
+        )
+        self.reminder_group = self._add_lazy_group(
+            "提醒设置", 3,
+            self._build_reminder_group, self._load_reminder_settings
+        )
+        self.system_group = self._add_lazy_group(
+            "系统设置", 5,
+            self._build_system_group, self._load_system_settings
+        )
+        self.advanced_group = self._add_lazy_group(
+            "高级设置", 4,
+            self._build_advanced_group, self._load_advanced_settings
+        )
+        
+        # 所有设置组，按显示顺序排列
+        self._groups = (
+            self.appearance_group, self.view_group, self.work_group,
+            self.reminder_group, self.system_group, self.advanced_group
+        )
+        
+        # 外观设置位于顶部，打开视图时总是可见，直接构建
+        self._build_group(self.appearance_group)
+        
+        # 底部空间
+        self.main_layout.addStretch(1)
+        
+        # 应用和取消按钮
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch(1)
+        
+        self.apply_button = PrimaryPushButton("应用", self)
+        self.apply_button.setIcon(FluentIcon.ACCEPT)
+        self.apply_button.clicked.connect(self.save_config)
+        buttons_layout.addWidget(self.apply_button)
+        
+        self.main_layout.addLayout(buttons_layout)
+        
+        # 滚动或内容高度变化时构建进入可见区域的设置组
+        self.verticalScrollBar().valueChanged.connect(self._build_visible_groups)
+        self.verticalScrollBar().rangeChanged.connect(self._build_visible_groups)
+    
+    def _add_lazy_group(self, title, card_count, builder, loader):
+        """
+        添加延迟构建的设置组
         
+        Args:
+            title: 组标题
+            card_count: 组内设置卡片数量，用于估算占位高度
+            builder: 创建组内设置卡片的函数
+            loader: 将配置加载到组内设置卡片的函数
+            
+        Returns:
+            占位的设置组
+        """
+        group = SettingCardGroup(title, self.main_widget)
+        # 按预估高度占位，使未构建的组不会全部挤进可见区域
+        group.setMinimumHeight(self.GROUP_HEADER_HEIGHT + card_count * self.CARD_HEIGHT)
+        self._group_builders[group] = (builder, loader)
+        self.main_layout.addWidget(group)
+        return group
+    
+    def _build_group(self, group):
+        """构建设置组的设置卡片，已构建时返回False"""
+        entry = self._group_builders.pop(group, None)
+        if entry is None:
+            return False
+        
+        builder, loader = entry
+        builder()
+        group.setMinimumHeight(0)
+        self._group_handlers[group] = loader
+        self._invalidate_search_index()
+        return True
+    
+    def _track_field(self, signal, section, key, getter):
+        """
+        登记设置卡片对应的配置项，控件值变化时标记为已修改
+        
+        Args:
+            signal: 控件值变化的信号
+            section: 配置所属部分，"user"或"system"
+            key: 配置键
+            getter: 从控件读取配置值的函数
+        """
+        self._field_getters[key] = getter
+        signal.connect(lambda *args: self._dirty.__setitem__(key, section))
+    
+    def _build_groups(self, groups):
+        """构建指定的设置组并加载其配置"""
+        built = [group for group in groups if self._build_group(group)]
+        if built:
+            self._load_groups(built)
+    
+    def _build_visible_groups(self, *args):
+        """构建与可见区域相交的设置组"""
+        if not self._group_builders:
+            return
+        
+        # 确保设置组的位置已按当前布局更新
+        self.main_layout.activate()
+        
+        # 主窗口坐标系下的可见区域
+        visible_rect = self.viewport().rect().translated(0, self.verticalScrollBar().value())
+        self._build_groups([
+            group for group in self._group_builders
+            if group.geometry().intersects(visible_rect)
+        ])
+    
+    def showEvent(self, event):
+        """显示时构建可见的设置组"""
+        super().showEvent(event)
+        if self._group_builders:
+            # 等待布局完成后再计算可见区域
+            QTimer.singleShot(0, self._build_visible_groups)
+    
+    def resizeEvent(self, event):
+        """尺寸变化时构建新进入可见区域的设置组"""
+        super().resizeEvent(event)
+        self._build_visible_groups()
+    
+    def _build_appearance_group(self):
+        """创建外观设置组的设置卡片"""
         # 主题设置
         self.theme_card = ComboBoxSettingCard(
             icon=FluentIcon.BRUSH,
@@ -387,6 +642,8 @@ class ConfigView(ScrollArea):
         self.theme_card.comboBox.addItems(["浅色", "深色", "跟随系统"])
         self.theme_card.comboBox.setCurrentIndex(2)  # 默认跟随系统
         self.theme_card.comboBox.currentIndexChanged.connect(self.on_theme_changed)
+        self._track_field(self.theme_card.comboBox.currentIndexChanged, "user", "theme",
+                          lambda: _THEME_CODES[self.theme_card.comboBox.currentIndex()])
         self.appearance_group.addSettingCard(self.theme_card)
         
         # 主题色设置
@@ -397,6 +654,8 @@ class ConfigView(ScrollArea):
             parent=self.appearance_group
         )
         self.theme_color_card.colorChanged.connect(self.on_theme_color_changed)
+        self._track_field(self.theme_color_card.colorChanged, "user", "theme_color",
+                          self.theme_color_card.rgb_hex)
         self.appearance_group.addSettingCard(self.theme_color_card)
         
         # 使用系统主题色
@@ -428,13 +687,12 @@ class ConfigView(ScrollArea):
         )
         self.language_card.comboBox.addItems(["简体中文", "English"])
         self.language_card.comboBox.setCurrentIndex(0)
+        self._track_field(self.language_card.comboBox.currentIndexChanged, "user", "language",
+                          lambda: _LANG_CODES[self.language_card.comboBox.currentIndex()])
         self.appearance_group.addSettingCard(self.language_card)
-        
-        self.main_layout.addWidget(self.appearance_group)
-        
-        # ================ 视图设置 ================
-        self.view_group = SettingCardGroup("视图设置", self.main_widget)
-        
+    
+    def _build_view_group(self):
+        """创建视图设置组的设置卡片"""
         # 默认视图
         self.default_view_card = ComboBoxSettingCard(
             icon=FluentIcon.VIEW,
@@ -443,6 +701,8 @@ class ConfigView(ScrollArea):
             parent=self.view_group
         )
         self.default_view_card.comboBox.addItems(["日程视图", "甘特图", "流程图"])
+        self._track_field(self.default_view_card.comboBox.currentIndexChanged, "user", "start_view",
+                          lambda: _VIEW_CODES[self.default_view_card.comboBox.currentIndex()])
         self.view_group.addSettingCard(self.default_view_card)
         
         # 显示已完成任务
@@ -452,6 +712,8 @@ class ConfigView(ScrollArea):
             content="在视图中显示已完成的任务",
             parent=self.view_group
         )
+        self._track_field(self.show_completed_card.switchButton.checkedChanged, "user", "show_completed_tasks",
+                          self.show_completed_card.isChecked)
         self.view_group.addSettingCard(self.show_completed_card)
         
         # 紧凑模式
@@ -473,12 +735,9 @@ class ConfigView(ScrollArea):
         self.animation_speed_card.comboBox.addItems(["关闭", "慢速", "正常", "快速"])
         self.animation_speed_card.comboBox.setCurrentIndex(2)  # 默认正常
         self.view_group.addSettingCard(self.animation_speed_card)
-        
-        self.main_layout.addWidget(self.view_group)
-        
-        # ================ 工作设置 ================
-        self.work_group = SettingCardGroup("工作设置", self.main_widget)
-        
+    
+    def _build_work_group(self):
+        """创建工作设置组的设置卡片"""
         # 工作日选择
         self.work_days_card = PushSettingCard(
             icon=FluentIcon.CALENDAR,
@@ -511,13 +770,12 @@ class ConfigView(ScrollArea):
         self.default_duration_card.spinBox.setRange(1, 24)
         self.default_duration_card.spinBox.setSingleStep(1)
         self.default_duration_card.spinBox.setValue(1)
+        self._track_field(self.default_duration_card.spinBox.valueChanged, "user", "default_task_duration_hours",
+                          self.default_duration_card.spinBox.value)
         self.work_group.addSettingCard(self.default_duration_card)
-        
-        self.main_layout.addWidget(self.work_group)
-        
-        # ================ 提醒设置 ================
-        self.reminder_group = SettingCardGroup("提醒设置", self.main_widget)
-        
+    
+    def _build_reminder_group(self):
+        """创建提醒设置组的设置卡片"""
         # 任务提醒
         self.enable_reminder_card = SwitchSettingCard(
             icon=FluentIcon.INFO,
@@ -525,6 +783,8 @@ class ConfigView(ScrollArea):
             content="在任务开始前发送提醒通知",
             parent=self.reminder_group
         )
+        self._track_field(self.enable_reminder_card.switchButton.checkedChanged, "user", "enable_reminder",
+                          self.enable_reminder_card.isChecked)
         self.reminder_group.addSettingCard(self.enable_reminder_card)
         
         # 提醒提前时间
@@ -536,6 +796,8 @@ class ConfigView(ScrollArea):
         )
         self.reminder_advance_card.spinBox.setRange(1, 120)
         self.reminder_advance_card.spinBox.setValue(15)
+        self._track_field(self.reminder_advance_card.spinBox.valueChanged, "user", "reminder_advance_minutes",
+                          self.reminder_advance_card.spinBox.value)
         self.reminder_group.addSettingCard(self.reminder_advance_card)
         
         # 提醒方式
@@ -548,12 +810,9 @@ class ConfigView(ScrollArea):
         self.reminder_method_card.comboBox.addItems(["系统通知", "弹窗提醒", "声音提醒", "全部"])
         self.reminder_method_card.comboBox.setCurrentIndex(0)
         self.reminder_group.addSettingCard(self.reminder_method_card)
-        
-        self.main_layout.addWidget(self.reminder_group)
-        
-        # ================ 系统设置 ================
-        self.system_group = SettingCardGroup("系统设置", self.main_widget)
-        
+    
+    def _build_system_group(self):
+        """创建系统设置组的设置卡片"""
         # 自动保存间隔
         self.auto_save_card = SpinBoxSettingCard(
             icon=FluentIcon.SAVE,
@@ -563,6 +822,8 @@ class ConfigView(ScrollArea):
         )
         self.auto_save_card.spinBox.setRange(1, 60)
         self.auto_save_card.spinBox.setValue(5)
+        self._track_field(self.auto_save_card.spinBox.valueChanged, "user", "auto_save_interval_minutes",
+                          self.auto_save_card.spinBox.value)
         self.system_group.addSettingCard(self.auto_save_card)
         
         # 数据目录
@@ -605,13 +866,12 @@ class ConfigView(ScrollArea):
             content="启动时检查程序更新",
             parent=self.system_group
         )
+        self._track_field(self.update_check_card.switchButton.checkedChanged, "system", "update_check",
+                          self.update_check_card.isChecked)
         self.system_group.addSettingCard(self.update_check_card)
-        
-        self.main_layout.addWidget(self.system_group)
-        
-        # ================ 高级设置 ================
-        self.advanced_group = SettingCardGroup("高级设置", self.main_widget)
-        
+    
+    def _build_advanced_group(self):
+        """创建高级设置组的设置卡片"""
         # 撤销步数
         self.undo_steps_card = SpinBoxSettingCard(
             icon=FluentIcon.RETURN,
@@ -630,6 +890,8 @@ class ConfigView(ScrollArea):
             content="在程序崩溃时发送匿名诊断信息",
             parent=self.advanced_group
         )
+        self._track_field(self.crash_report_card.switchButton.checkedChanged, "system", "enable_crash_report",
+                          self.crash_report_card.isChecked)
         self.advanced_group.addSettingCard(self.crash_report_card)
         
         # 日志级别
@@ -651,54 +913,57 @@ class ConfigView(ScrollArea):
             parent=self.advanced_group
         )
         self.advanced_group.addSettingCard(self.developer_mode_card)
-        
-        self.main_layout.addWidget(self.advanced_group)
-        
-        # 底部空间
-        self.main_layout.addStretch(1)
-        
-        # 应用和取消按钮
-        buttons_layout = QHBoxLayout()
-        buttons_layout.addStretch(1)
-        
-        self.apply_button = PrimaryPushButton("应用", self)
-        self.apply_button.setIcon(FluentIcon.ACCEPT)
-        self.apply_button.clicked.connect(self.save_config)
-        buttons_layout.addWidget(self.apply_button)
-        
-        self.main_layout.addLayout(buttons_layout)
     
+    @pyqtSlot(str)
     def search_config(self, text):
         """搜索配置项"""
+        groups = self._groups
+        
         if not text:
             # 如果搜索框为空，显示所有设置组
-            for group in [self.appearance_group, self.view_group, self.work_group, 
-                          self.reminder_group, self.system_group, self.advanced_group]:
-                group.setVisible(True)
-            return
+            visibility = [True] * len(groups)
+        else:
+            # 搜索需要检查所有设置卡片，先构建剩余的设置组
+            self._build_groups(list(self._group_builders))
             
-        # 转换为小写进行不区分大小写搜索
-        search_text = text.lower()
-        
-        # 检查每个设置组中的设置卡是否匹配搜索文本
-        for group in [self.appearance_group, self.view_group, self.work_group, 
-                      self.reminder_group, self.system_group, self.advanced_group]:
-            # 检查组标题是否匹配
-            group_match = search_text in group.title().lower()
+            # 转换为小写进行不区分大小写搜索
+            search_text = text.lower()
             
-            # 检查组内每个设置卡是否匹配
-            cards_match = False
-            for i in range(group.layout().count()):
-                widget = group.layout().itemAt(i).widget()
-                if widget and hasattr(widget, 'title') and hasattr(widget, 'content'):
-                    if (search_text in widget.title().lower() or 
-                        search_text in widget.content().lower()):
-                        cards_match = True
-                        break
+            if self._search_index is None:
+                self._rebuild_search_index()
             
-            # 如果组标题或任何设置卡匹配，显示该组，否则隐藏
-            group.setVisible(group_match or cards_match)
+            # 组标题或任何设置卡匹配的组
+            matched_groups = {
+                group for group, title in self._group_title_lc.items()
+                if search_text in title
+            }
+            matched_groups.update(
+                group for group, card in self._search_index
+                if search_text in card.title_lc or search_text in card.content_lc
+            )
+            visibility = [group in matched_groups for group in groups]
+        
+        # 暂停刷新并跳过可见性未变化的组，使筛选只触发一次重新布局
+        self.main_widget.setUpdatesEnabled(False)
+        for group, visible in zip(groups, visibility):
+            if group.isHidden() == visible:
+                group.setVisible(visible)
+        self.main_widget.setUpdatesEnabled(True)
+        self.main_widget.updateGeometry()
     
+    def _rebuild_search_index(self):
+        """重建搜索索引，收集已构建的设置卡片和小写的组标题"""
+        self._search_index = []
+        self._group_title_lc = {}
+        for group in self._group_handlers:
+            self._group_title_lc[group] = group.title().lower()
+            self._search_index += [(group, card) for card in group.cards()]
+    
+    def _invalidate_search_index(self):
+        """构建新的设置组后使搜索索引失效，下次搜索时重建"""
+        self._search_index = None
+    
+    @pyqtSlot()
     def import_config(self):
         """从文件导入配置"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -707,30 +972,34 @@ class ConfigView(ScrollArea):
         
         if not file_path:
             return
-            
+        
+        # 在后台线程读取并解析文件，完成后回到界面线程确认和应用
+        def read_config():
+            with open(file_path, 'rb') as f:
+                return _load_config_json(f.read())
+        
+        self._start_json_worker(read_config, self._on_import_parsed, self._on_import_failed)
+    
+    @pyqtSlot(object)
+    def _on_import_parsed(self, config_data):
+        """配置文件解析完成，确认后应用导入的配置"""
+        self._set_io_busy(False)
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                
             # 显示确认对话框
-            confirm_dialog = MessageBox(
-                "导入配置",
-                "导入配置将覆盖当前的所有设置，确定要继续吗？",
-                self
-            )
-            
-            if confirm_dialog.exec_():
+            if self._confirm("导入配置", "导入配置将覆盖当前的所有设置，确定要继续吗？"):
                 # 导入各个配置组
                 for group_name, group_data in config_data.items():
                     if group_name in self.config_manager.config_groups:
                         self.config_manager.config_groups[group_name].items = group_data
                 
-                # 保存到配置文件
-                for group_name in config_data.keys():
-                    self.config_manager.save_config_group(group_name)
+                # 保存到配置文件，每个文件只写入一次
+                self.config_manager.save_all(list(config_data.keys()))
                 
                 # 重新加载配置
                 self.load_config()
+                # 加载时屏蔽了信号，需要手动应用新的主题模式
+                self.on_theme_changed(self.theme_card.comboBox.currentIndex())
                 
                 InfoBar.success(
                     title="成功",
@@ -741,14 +1010,21 @@ class ConfigView(ScrollArea):
                 )
                 
         except Exception as e:
-            InfoBar.error(
-                title="错误",
-                content=f"配置导入失败: {str(e)}",
-                parent=self,
-                position=InfoBarPosition.TOP,
-                duration=3000
-            )
+            self._on_import_failed(str(e))
     
+    @pyqtSlot(str)
+    def _on_import_failed(self, error):
+        """配置导入失败"""
+        self._set_io_busy(False)
+        InfoBar.error(
+            title="错误",
+            content=f"配置导入失败: {error}",
+            parent=self,
+            position=InfoBarPosition.TOP,
+            duration=3000
+        )
+    
+    @pyqtSlot()
     def export_config(self):
         """导出配置到文件"""
         file_path, _ = QFileDialog.getSaveFileName(
@@ -757,50 +1033,98 @@ class ConfigView(ScrollArea):
         
         if not file_path:
             return
+        
+        # 在界面线程收集所有配置组数据的快照，序列化和写文件放到后台线程
+        config_data = {
+            name: copy.deepcopy(group.items)
+            for name, group in self.config_manager.config_groups.items()
+        }
+        
+        def write_config():
+            data = _dump_config_json(config_data)
+            with open(file_path, 'wb') as f:
+                f.write(data)
+        
+        self._start_json_worker(write_config, self._on_export_done, self._on_export_failed)
+    
+    @pyqtSlot(object)
+    def _on_export_done(self, result):
+        """配置导出完成"""
+        self._set_io_busy(False)
+        InfoBar.success(
+            title="成功",
+            content="配置导出成功",
+            parent=self,
+            position=InfoBarPosition.TOP,
+            duration=2000
+        )
+    
+    @pyqtSlot(str)
+    def _on_export_failed(self, error):
+        """配置导出失败"""
+        self._set_io_busy(False)
+        InfoBar.error(
+            title="错误",
+            content=f"配置导出失败: {error}",
+            parent=self,
+            position=InfoBarPosition.TOP,
+            duration=3000
+        )
+    
+    def _confirm(self, title, content):
+        """
+        显示确认对话框
+        
+        每次调用都新建对话框：MessageBox缩放时会恢复创建时的文本，关闭时会移除阴影效果，无法复用
+        
+        Args:
+            title: 标题
+            content: 内容
             
-        try:
-            # 收集所有配置组数据
-            config_data = {}
-            for name, group in self.config_manager.config_groups.items():
-                config_data[name] = group.items
-                
-            # 写入文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=4)
-                
-            InfoBar.success(
-                title="成功",
-                content="配置导出成功",
-                parent=self,
-                position=InfoBarPosition.TOP,
-                duration=2000
-            )
-                
-        except Exception as e:
-            InfoBar.error(
-                title="错误",
-                content=f"配置导出失败: {str(e)}",
-                parent=self,
-                position=InfoBarPosition.TOP,
-                duration=3000
-            )
+        Returns:
+            用户是否确认
+        """
+        dialog = MessageBox(title, content, self)
+        dialog.yesButton.setText("确认")
+        dialog.cancelButton.setText("取消")
+        return dialog.exec_()
+    
+    def _start_json_worker(self, func, on_finished, on_failed):
+        """
+        在全局线程池中执行配置文件任务
+        
+        Args:
+            func: 在后台线程执行的无参函数
+            on_finished: 成功时在界面线程调用的槽，参数为func的返回值
+            on_failed: 失败时在界面线程调用的槽，参数为错误信息
+        """
+        worker = _JsonWorker(func)
+        # 连接到本对象的槽，信号会排队回到界面线程处理
+        worker.signals.finished.connect(on_finished)
+        worker.signals.failed.connect(on_failed)
+        # 保留引用，避免任务执行期间信号对象被回收
+        self._json_worker = worker
+        self._set_io_busy(True)
+        QThreadPool.globalInstance().start(worker)
     
+    def _set_io_busy(self, busy):
+        """后台读写配置文件期间禁用会修改配置的操作按钮"""
+        for button in (self.import_button, self.export_button, self.reset_button, self.apply_button):
+            button.setEnabled(not busy)
+    
+    @pyqtSlot()
     def reset_config(self):
         """重置配置到默认设置"""
         # 显示确认对话框
-        confirm_dialog = MessageBox(
-            "重置设置",
-            "确定要将所有设置恢复为默认值吗？此操作无法撤销。",
-            self
-        )
-        
-        if confirm_dialog.exec_():
+        if self._confirm("重置设置", "确定要将所有设置恢复为默认值吗？此操作无法撤销。"):
             # 调用配置管理器的重置功能
             result = self.config_manager.reset_config()
             
             if result:
                 # 重新加载配置
                 self.load_config()
+                # 加载时屏蔽了信号，需要手动应用新的主题模式
+                self.on_theme_changed(self.theme_card.comboBox.currentIndex())
                 
                 InfoBar.success(
                     title="成功",
@@ -820,70 +1144,19 @@ class ConfigView(ScrollArea):
     
     def load_config(self):
         """从配置管理器加载配置"""
+        self._load_groups(self._group_handlers)
+        # 控件已与配置一致，之前的修改标记不再有效
+        self._dirty.clear()
+    
+    def _load_groups(self, groups):
+        """将配置加载到指定的已构建设置组"""
         try:
-            # 加载用户配置
+            # 加载用户配置和系统配置
             user_config = self.config_manager.user_config
-            
-            # 主题设置
-            theme = user_config.get("theme", "auto")
-            if theme == "light":
-                self.theme_card.comboBox.setCurrentIndex(0)
-            elif theme == "dark":
-                self.theme_card.comboBox.setCurrentIndex(1)
-            else:  # auto
-                self.theme_card.comboBox.setCurrentIndex(2)
-            
-            # 语言设置
-            language = user_config.get("language", "zh_CN")
-            if language == "zh_CN":
-                self.language_card.comboBox.setCurrentIndex(0)
-            else:  # en_US
-                self.language_card.comboBox.setCurrentIndex(1)
-            
-            # 主题色
-            theme_color = user_config.get("theme_color", "#2196F3")
-            self.theme_color_card.setColor(QColor(theme_color))
-            
-            # 默认视图
-            start_view = user_config.get("start_view", "calendar")
-            if start_view == "calendar":
-                self.default_view_card.comboBox.setCurrentIndex(0)
-            elif start_view == "gantt":
-                self.default_view_card.comboBox.setCurrentIndex(1)
-            else:  # flow
-                self.default_view_card.comboBox.setCurrentIndex(2)
-            
-            # 显示已完成任务
-            show_completed = user_config.get("show_completed_tasks", True)
-            self.show_completed_card.setChecked(show_completed)
-            
-            # 默认任务时长
-            default_duration = user_config.get("default_task_duration_hours", 1)
-            self.default_duration_card.spinBox.setValue(default_duration)
-            
-            # 提醒设置
-            enable_reminder = user_config.get("enable_reminder", True)
-            self.enable_reminder_card.setChecked(enable_reminder)
-            
-            reminder_advance = user_config.get("reminder_advance_minutes", 15)
-            self.reminder_advance_card.spinBox.setValue(reminder_advance)
-            
-            # 系统设置
             system_config = self.config_manager.system_config
             
-            auto_save_interval = user_config.get("auto_save_interval_minutes", 5)
-            self.auto_save_card.spinBox.setValue(auto_save_interval)
-            
-            update_check = system_config.get("update_check", True)
-            self.update_check_card.setChecked(update_check)
-            
-            crash_report = system_config.get("enable_crash_report", True)
-            self.crash_report_card.setChecked(crash_report)
-            
-            # 数据目录
-            data_dir = system_config.get("data_dir", "")
-            if data_dir:
-                self.data_dir_card.setContent(data_dir)
+            for group in groups:
+                self._group_handlers[group](user_config, system_config)
             
         except Exception as e:
             InfoBar.error(
@@ -894,65 +1167,125 @@ class ConfigView(ScrollArea):
                 duration=3000
             )
     
+    def _load_appearance_settings(self, user_config, system_config):
+        """加载外观设置"""
+        # 加载期间屏蔽控件信号，避免触发变更处理，函数返回时自动恢复
+        blockers = [QSignalBlocker(widget) for widget in (
+            self.theme_card.comboBox,
+            self.language_card.comboBox,
+            self.theme_color_card.colorButton,
+        )]
+        
+        # 主题设置，未知值按跟随系统处理
+        theme = user_config.get("theme", "auto")
+        self.theme_card.comboBox.setCurrentIndex(_THEME_INDEX.get(theme, 2))
+        
+        # 语言设置，未知值按英文处理
+        language = user_config.get("language", "zh_CN")
+        self.language_card.comboBox.setCurrentIndex(_LANG_INDEX.get(language, 1))
+        
+        # 主题色
+        theme_color = user_config.get("theme_color", "#2196F3")
+        self.theme_color_card.setColor(QColor(theme_color))
+    
+    def _load_view_settings(self, user_config, system_config):
+        """加载视图设置"""
+        # 加载期间屏蔽控件信号，避免触发变更处理，函数返回时自动恢复
+        blockers = [QSignalBlocker(widget) for widget in (
+            self.default_view_card.comboBox,
+            self.show_completed_card.switchButton,
+        )]
+        
+        # 默认视图，未知值按流程图处理
+        start_view = user_config.get("start_view", "calendar")
+        self.default_view_card.comboBox.setCurrentIndex(_VIEW_INDEX.get(start_view, 2))
+        
+        # 显示已完成任务
+        show_completed = user_config.get("show_completed_tasks", True)
+        self.show_completed_card.setChecked(show_completed)
+    
+    def _load_work_settings(self, user_config, system_config):
+        """加载工作设置"""
+        # 加载期间屏蔽控件信号，避免触发变更处理，函数返回时自动恢复
+        blockers = [QSignalBlocker(widget) for widget in (
+            self.default_duration_card.spinBox,
+        )]
+        
+        # 默认任务时长
+        default_duration = user_config.get("default_task_duration_hours", 1)
+        self.default_duration_card.spinBox.setValue(default_duration)
+    
+    def _load_reminder_settings(self, user_config, system_config):
+        """加载提醒设置"""
+        # 加载期间屏蔽控件信号，避免触发变更处理，函数返回时自动恢复
+        blockers = [QSignalBlocker(widget) for widget in (
+            self.enable_reminder_card.switchButton,
+            self.reminder_advance_card.spinBox,
+        )]
+        
+        enable_reminder = user_config.get("enable_reminder", True)
+        self.enable_reminder_card.setChecked(enable_reminder)
+        
+        reminder_advance = user_config.get("reminder_advance_minutes", 15)
+        self.reminder_advance_card.spinBox.setValue(reminder_advance)
+    
+    def _load_system_settings(self, user_config, system_config):
+        """加载系统设置"""
+        # 加载期间屏蔽控件信号，避免触发变更处理，函数返回时自动恢复
+        blockers = [QSignalBlocker(widget) for widget in (
+            self.auto_save_card.spinBox,
+            self.update_check_card.switchButton,
+        )]
+        
+        auto_save_interval = user_config.get("auto_save_interval_minutes", 5)
+        self.auto_save_card.spinBox.setValue(auto_save_interval)
+        
+        update_check = system_config.get("update_check", True)
+        self.update_check_card.setChecked(update_check)
+        
+        # 数据目录
+        data_dir = system_config.get("data_dir", "")
+        if data_dir:
+            self.data_dir_card.setContent(data_dir)
+    
+    def _load_advanced_settings(self, user_config, system_config):
+        """加载高级设置"""
+        # 加载期间屏蔽控件信号，避免触发变更处理，函数返回时自动恢复
+        blockers = [QSignalBlocker(widget) for widget in (
+            self.crash_report_card.switchButton,
+        )]
+        
+        crash_report = system_config.get("enable_crash_report", True)
+        self.crash_report_card.setChecked(crash_report)
+    
+    @pyqtSlot()
     def save_config(self):
-        """保存配置到配置管理器"""
+        """保存配置到配置管理器，只写入修改过的配置项"""
         try:
-            # 用户配置
-            user_config = self.config_manager.user_config
+            configs = {
+                "user": self.config_manager.user_config,
+                "system": self.config_manager.system_config,
+            }
             
-            # 主题设置
-            theme_index = self.theme_card.comboBox.currentIndex()
-            if theme_index == 0:
-                user_config["theme"] = "light"
-            elif theme_index == 1:
-                user_config["theme"] = "dark"
-            else:
-                user_config["theme"] = "auto"
-            
-            # 语言设置
-            language_index = self.language_card.comboBox.currentIndex()
-            user_config["language"] = "zh_CN" if language_index == 0 else "en_US"
-            
-            # 主题色
-            theme_color = self.theme_color_card.color().name()
-            user_config["theme_color"] = theme_color
-            
-            # 默认视图
-            view_index = self.default_view_card.comboBox.currentIndex()
-            if view_index == 0:
-                user_config["start_view"] = "calendar"
-            elif view_index == 1:
-                user_config["start_view"] = "gantt"
-            else:
-                user_config["start_view"] = "flow"
-            
-            # 显示已完成任务
-            user_config["show_completed_tasks"] = self.show_completed_card.isChecked()
-            
-            # 默认任务时长
-            user_config["default_task_duration_hours"] = self.default_duration_card.spinBox.value()
-            
-            # 提醒设置
-            user_config["enable_reminder"] = self.enable_reminder_card.isChecked()
-            user_config["reminder_advance_minutes"] = self.reminder_advance_card.spinBox.value()
-            
-            # 自动保存间隔
-            user_config["auto_save_interval_minutes"] = self.auto_save_card.spinBox.value()
-            
-            # 保存用户配置
-            self.config_manager.save_user_config()
-            
-            # 系统配置
-            system_config = self.config_manager.system_config
-            
-            # 更新检查
-            system_config["update_check"] = self.update_check_card.isChecked()
+            # 只记录值确实发生变化的部分，改回原值的配置项不会触发写入
+            sections = set()
+            for key, section in self._dirty.items():
+                getter = self._field_getters.get(key)
+                if getter is None:
+                    # 没有读取函数的配置项已由对话框直接写入配置
+                    sections.add(section)
+                    continue
+                
+                value = getter()
+                if configs[section].get(key) != value:
+                    configs[section][key] = value
+                    sections.add(section)
             
-            # 崩溃报告
-            system_config["enable_crash_report"] = self.crash_report_card.isChecked()
+            # 用户配置和系统配置一次批量写入，没有修改的部分不写入
+            if sections and not self.config_manager.save_all(sorted(sections)):
+                raise IOError("写入配置文件失败")
             
-            # 保存系统配置
-            self.config_manager.save_system_config()
+            self._dirty.clear()
             
             # 显示成功信息
             InfoBar.success(
@@ -976,9 +1309,15 @@ class ConfigView(ScrollArea):
             )
     
     def apply_theme_settings(self):
-        """应用主题设置"""
-        # 设置主题
+        """应用主题设置，与上次应用的设置相同时跳过"""
         theme_index = self.theme_card.comboBox.currentIndex()
+        theme_color = self.theme_color_card.color()
+        applied = (theme_index, self.theme_color_card.rgb_hex())
+        if applied == self._applied_theme:
+            return
+        self._applied_theme = applied
+        
+        # 设置主题
         if theme_index == 0:
             setTheme(Theme.LIGHT)
         elif theme_index == 1:
@@ -988,14 +1327,12 @@ class ConfigView(ScrollArea):
             pass
         
         # 设置主题色
-        theme_color = self.theme_color_card.color()
         setThemeColor(theme_color)
     
+    @pyqtSlot()
     def show_work_days_dialog(self):
         """显示工作日设置对话框"""
         # 创建一个对话框
-        from qfluentwidgets import Dialog
-        
         dialog = Dialog("工作日设置", self.window())
         
         # 创建内容
@@ -1058,6 +1395,7 @@ class ConfigView(ScrollArea):
         
         # 更新配置
         self.config_manager.user_config["work_days"] = work_days
+        self._dirty["work_days"] = "user"
         
         # 更新工作日卡片内容
         days = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
@@ -1067,11 +1405,10 @@ class ConfigView(ScrollArea):
         # 关闭对话框
         dialog.accept()
     
+    @pyqtSlot()
     def show_work_hours_dialog(self):
         """显示工作时间设置对话框"""
         # 创建一个对话框
-        from qfluentwidgets import Dialog
-        
         dialog = Dialog("工作时间设置", self.window())
         
         # 创建内容
@@ -1095,8 +1432,8 @@ class ConfigView(ScrollArea):
         
         # 加载当前设置
         work_hours = self.config_manager.user_config.get("work_hours", {"start": "09:00", "end": "18:00"})
-        self.start_time_edit.setTime(QTime.fromString(work_hours.get("start", "09:00"), "HH:mm"))
-        self.end_time_edit.setTime(QTime.fromString(work_hours.get("end", "18:00"), "HH:mm"))
+        self.start_time_edit.setTime(_parse_hhmm(work_hours.get("start", "09:00"), "09:00"))
+        self.end_time_edit.setTime(_parse_hhmm(work_hours.get("end", "18:00"), "18:00"))
         
         form_layout.addWidget(start_label, 0, 0)
         form_layout.addWidget(self.start_time_edit, 0, 1)
@@ -1146,6 +1483,7 @@ class ConfigView(ScrollArea):
             "start": start_time,
             "end": end_time
         }
+        self._dirty["work_hours"] = "user"
         
         # 更新工作时间卡片内容
         self.work_hours_card.setContent(f"{start_time} - {end_time}")
@@ -1153,6 +1491,7 @@ class ConfigView(ScrollArea):
         # 关闭对话框
         dialog.accept()
     
+    @pyqtSlot()
     def select_data_dir(self):
         """选择数据目录"""
         # 获取当前数据目录
@@ -1167,17 +1506,7 @@ class ConfigView(ScrollArea):
         
         if data_dir:
             # 显示确认对话框
-            message_box = MessageBoxBase(
-                title="确认更改",
-                content="更改数据目录将重新启动应用程序，是否继续？",
-                parent=self.window()
-            )
-            
-            # 添加按钮
-            message_box.yesButton.setText("确认")
-            message_box.cancelButton.setText("取消")
-            
-            if message_box.exec_():
+            if self._confirm("确认更改", "更改数据目录将重新启动应用程序，是否继续？"):
                 # 更新配置
                 self.config_manager.system_config["data_dir"] = data_dir
                 self.config_manager.save_system_config()
@@ -1194,6 +1523,7 @@ class ConfigView(ScrollArea):
                     duration=3000
                 )
     
+    @pyqtSlot()
     def create_backup(self):
         """创建数据备份"""
         try:
@@ -1224,19 +1554,15 @@ class ConfigView(ScrollArea):
                 duration=3000
             )
     
+    @pyqtSlot()
     def restore_backup(self):
         """恢复数据备份"""
         try:
-            # 获取备份目录
-            import os
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            backup_dir = os.path.join(base_dir, 'data', 'backups')
-            
             # 打开文件选择对话框
             backup_file, _ = QFileDialog.getOpenFileName(
                 self,
                 "选择备份文件",
-                backup_dir,
+                BACKUP_DIR,
                 "备份文件 (*.zip)"
             )
             
@@ -1244,17 +1570,7 @@ class ConfigView(ScrollArea):
                 return
             
             # 显示确认对话框
-            message_box = MessageBoxBase(
-                title="确认恢复",
-                content="恢复备份将覆盖当前数据，是否继续？",
-                parent=self.window()
-            )
-            
-            # 添加按钮
-            message_box.yesButton.setText("确认")
-            message_box.cancelButton.setText("取消")
-            
-            if message_box.exec_():
+            if self._confirm("确认恢复", "恢复备份将覆盖当前数据，是否继续？"):
                 # 恢复备份
                 success = self.config_manager.restore_backup(backup_file)
                 
@@ -1283,6 +1599,7 @@ class ConfigView(ScrollArea):
                 duration=3000
             )
     
+    @pyqtSlot(int)
     def on_theme_changed(self, index):
         """主题变更事件处理"""
         if index == 0:  # 浅色
@@ -1293,6 +1610,7 @@ class ConfigView(ScrollArea):
             # 可以根据系统主题设置
             pass
     
+    @pyqtSlot(QColor)
     def on_theme_color_changed(self, color):
         """主题色变更事件处理"""
         setThemeColor(color) 
\ No newline at end of file
@@ -7,14 +7,18 @@
 """
 
 import math
+import weakref
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from datetime import datetime, timedelta
 
-from PyQt5.QtCore import Qt, QRectF, QPointF, QSizeF, pyqtSignal
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPainterPath
+from PyQt5.QtCore import Qt, QRectF, QPointF, QSizeF, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QPainterPath
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QScrollArea, QFrame, QGraphicsScene, QGraphicsView,
-    QGraphicsItem, QGraphicsRectItem, QGraphicsTextItem,
+    QGraphicsItem, QGraphicsRectItem,
     QGraphicsLineItem, QGraphicsPathItem, QGraphicsProxyWidget,
     QMenu, QComboBox
 )
@@ -26,96 +30,130 @@ from qfluentwidgets import (
 )
 
 from ui.task_dialog import TaskDialog
+from ui.fonts import yahei, font_metrics, YAHEI_8
+
+
+def _priority_style(bg_color, border_color):
+    """创建优先级对应的(画刷, 画笔, 选中画笔)"""
+    pen = QPen(border_color, 2)
+    selected_pen = QPen(border_color, 2)
+    selected_pen.setStyle(Qt.DashLine)  # 选中状态使用虚线
+    return QBrush(bg_color), pen, selected_pen
+
+
+# 任务节点各优先级的绘制样式，所有节点共享
+_PRIORITY_STYLE = {
+    "低": _priority_style(QColor(200, 230, 201), QColor(76, 175, 80)),
+    "中": _priority_style(QColor(187, 222, 251), QColor(33, 150, 243)),
+    "高": _priority_style(QColor(255, 224, 178), QColor(255, 152, 0)),
+    "紧急": _priority_style(QColor(255, 205, 210), QColor(244, 67, 54)),
+}
+
+# 节点文本和空场景提示使用的字体
+_TITLE_FONT = yahei(10, bold=True)
+_TIME_FONT = YAHEI_8
+_PLACEHOLDER_FONT = yahei(12)
+_TEXT_PEN = QPen(QColor(0, 0, 0))
+_ARROW_PEN = QPen(QColor(100, 100, 100), 2)
+
+# 箭头两翼相对终点的偏移（箭头长10，两翼与轴线夹角30度）
+_ARROW_WING_X = math.cos(math.pi / 6) * 10
+_ARROW_WING_Y = math.sin(math.pi / 6) * 10
+
+@lru_cache(maxsize=4096)
+def _format_time(value):
+    """格式化节点上显示的时间，结果按时间值缓存，节点重建时复用"""
+    return value.strftime('%Y-%m-%d %H:%M')
 
 class FlowTaskNode(QGraphicsRectItem):
     """流程图中的任务节点"""
     
-    def __init__(self, task_data, parent=None):
+    # 节点尺寸
+    WIDTH = 200
+    HEIGHT = 80
+    
+    # 标题和时间文本的绘制区域（节点坐标）
+    TITLE_RECT = QRectF(14, 9, 176, 20)
+    TIME_RECT = QRectF(14, 34, 176, 40)
+    
+    def __init__(self, task_data, flow_view=None, parent=None):
         super().__init__(parent)
         self.task_data = task_data
-        self.setRect(0, 0, 200, 80)
-        self.setFlags(QGraphicsItem.ItemIsSelectable | QGraphicsItem.ItemIsMovable)
-        
-        # 根据优先级设置颜色
+        # 所属流程图视图的弱引用，双击编辑时使用
+        self._flow_view = weakref.proxy(flow_view) if flow_view is not None else None
+        self.setRect(0, 0, self.WIDTH, self.HEIGHT)
+        self.setFlags(QGraphicsItem.ItemIsSelectable | QGraphicsItem.ItemIsMovable
+                      | QGraphicsItem.ItemSendsGeometryChanges)
+        # 节点内容创建后不再变化，缓存为设备坐标下的位图，平移和选择时直接贴图
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        
+        # 根据优先级选择样式，未知优先级按紧急处理
         priority = task_data.get("priority", "中")
-        if priority == "低":
-            self.bg_color = QColor(200, 230, 201)
-            self.border_color = QColor(76, 175, 80)
-        elif priority == "中":
-            self.bg_color = QColor(187, 222, 251)
-            self.border_color = QColor(33, 150, 243)
-        elif priority == "高":
-            self.bg_color = QColor(255, 224, 178)
-            self.border_color = QColor(255, 152, 0)
-        else:  # 紧急
-            self.bg_color = QColor(255, 205, 210)
-            self.border_color = QColor(244, 67, 54)
+        self._brush, self._pen, self._selected_pen = _PRIORITY_STYLE.get(
+            priority, _PRIORITY_STYLE["紧急"])
             
-        # 创建文本项
-        self.title_item = QGraphicsTextItem(self)
-        self.title_item.setPlainText(task_data.get("title", "无标题"))
-        self.title_item.setPos(10, 5)
-        self.title_item.setFont(QFont("Microsoft YaHei", 10, QFont.Bold))
+        # 标题和时间文本在paint中直接绘制，标题过长时省略显示
+        self._title_str = font_metrics(_TITLE_FONT).elidedText(
+            task_data.get("title", "无标题"), Qt.ElideRight, self.TITLE_RECT.width())
         
-        # 创建时间项
         start_time = task_data.get("start_time")
         end_time = task_data.get("end_time")
-        time_text = f"开始: {start_time.strftime('%Y-%m-%d %H:%M')}\n结束: {end_time.strftime('%Y-%m-%d %H:%M')}"
-        
-        self.time_item = QGraphicsTextItem(self)
-        self.time_item.setPlainText(time_text)
-        self.time_item.setPos(10, 30)
-        self.time_item.setFont(QFont("Microsoft YaHei", 8))
+        self._time_str = f"开始: {_format_time(start_time)}\n结束: {_format_time(end_time)}"
         
         # 记录连接点
         self.source_point = QPointF(0, 40)
         self.target_point = QPointF(200, 40)
         
+        # 以该节点为端点的箭头，节点移动时更新它们的路径
+        self._incident_arrows = []
+        
+        # 创建节点时的任务数据快照，用于判断任务是否被修改
+        self._snapshot = dict(task_data)
+        
+    def matches(self, task_data):
+        """判断节点是否仍与任务数据一致"""
+        return self._snapshot == task_data
+        
+    def itemChange(self, change, value):
+        """节点位置变化后（布局或拖动）更新相连箭头的路径"""
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            for arrow in self._incident_arrows:
+                arrow.update_path()
+        return super().itemChange(change, value)
+        
     def paint(self, painter, option, widget):
         """绘制任务节点"""
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # 绘制背景
-        painter.setBrush(QBrush(self.bg_color))
-        pen = QPen(self.border_color, 2)
-        painter.setPen(pen)
-        
-        if self.isSelected():
-            # 选中状态使用虚线
-            pen.setStyle(Qt.DashLine)
-            painter.setPen(pen)
-            
+        # 绘制背景，选中状态使用虚线边框
+        painter.setBrush(self._brush)
+        painter.setPen(self._selected_pen if self.isSelected() else self._pen)
         painter.drawRoundedRect(self.rect(), 5, 5)
+        
+        # 绘制标题和时间
+        painter.setPen(_TEXT_PEN)
+        painter.setFont(_TITLE_FONT)
+        painter.drawText(self.TITLE_RECT, Qt.AlignLeft | Qt.AlignVCenter, self._title_str)
+        painter.setFont(_TIME_FONT)
+        painter.drawText(self.TIME_RECT, Qt.AlignLeft | Qt.AlignTop, self._time_str)
             
     def mouseDoubleClickEvent(self, event):
         """双击处理：打开任务编辑对话框"""
-        # 寻找主窗口和流程图视图
-        window = self.window()
-        
-        # 正确获取scheduler_manager
-        flow_view = None
-        parent = self.parent()
-        while parent:
-            if hasattr(parent, 'scheduler_manager'):
-                flow_view = parent
-                break
-            parent = parent.parent()
-        
-        if flow_view and hasattr(flow_view, 'scheduler_manager'):
-            dialog = TaskDialog(window, flow_view.scheduler_manager, self.task_data)
-            if dialog.exec_():
-                # 编辑成功后刷新视图
-                flow_view.refresh()
-        else:
-            # 回退方案：直接从父视图获取scheduler_manager
-            from ui.main_window import SchedulerMainWindow
-            if isinstance(window, SchedulerMainWindow):
-                dialog = TaskDialog(window, window.scheduler_manager, self.task_data)
-                if dialog.exec_():
-                    # 找到FlowView并刷新
-                    flow_view = window.findChild(QWidget, "flowView")
-                    if flow_view and hasattr(flow_view, 'refresh'):
-                        flow_view.refresh()
+        flow_view = self._flow_view
+        if flow_view is None:
+            super().mouseDoubleClickEvent(event)
+            return
+        
+        try:
+            window = flow_view.window()
+        except ReferenceError:
+            # 所属的流程图视图已被销毁
+            return
+        
+        dialog = TaskDialog(window, flow_view.scheduler_manager, self.task_data)
+        if dialog.exec_():
+            # 编辑成功后刷新视图
+            flow_view.refresh()
 
 class FlowTaskArrow(QGraphicsPathItem):
     """流程图中连接任务的箭头"""
@@ -124,52 +162,56 @@ class FlowTaskArrow(QGraphicsPathItem):
         super().__init__(parent)
         self.start_node = start_node
         self.end_node = end_node
+        start_node._incident_arrows.append(self)
+        end_node._incident_arrows.append(self)
         self.setZValue(-1)  # 确保箭头在节点下方显示
+        self.setPen(_ARROW_PEN)
+        self._bounds = QRectF()
         self.update_path()
         
     def update_path(self):
         """更新箭头路径"""
-        # 计算起点和终点位置
-        source_pos = self.start_node.mapToScene(self.start_node.target_point)
-        target_pos = self.end_node.mapToScene(self.end_node.source_point)
+        # 节点是场景顶层图形项且没有变换，直接由位置计算连接点，省去mapToScene
+        source_pos = self.start_node.pos() + self.start_node.target_point
+        target_pos = self.end_node.pos() + self.end_node.source_point
+        sx, sy = source_pos.x(), source_pos.y()
+        tx, ty = target_pos.x(), target_pos.y()
         
         # 创建路径
         path = QPainterPath()
-        path.moveTo(source_pos)
-        
-        # 计算控制点
-        dx = target_pos.x() - source_pos.x()
-        control1 = QPointF(source_pos.x() + dx * 0.4, source_pos.y())
-        control2 = QPointF(target_pos.x() - dx * 0.4, target_pos.y())
-        
-        # 绘制贝塞尔曲线
-        path.cubicTo(control1, control2, target_pos)
-        
-        # 添加箭头
-        angle = math.atan2(target_pos.y() - control2.y(), target_pos.x() - control2.x())
-        arrow_size = 10
-        
-        arrow_p1 = target_pos - QPointF(math.cos(angle + math.pi/6) * arrow_size,
-                                       math.sin(angle + math.pi/6) * arrow_size)
-        arrow_p2 = target_pos - QPointF(math.cos(angle - math.pi/6) * arrow_size,
-                                       math.sin(angle - math.pi/6) * arrow_size)
+        path.moveTo(sx, sy)
+        
+        # 计算控制点并绘制贝塞尔曲线
+        dx = tx - sx
+        path.cubicTo(sx + dx * 0.4, sy, tx - dx * 0.4, ty, tx, ty)
+        
+        # 添加箭头：第二个控制点与终点同高，箭头方向只可能水平向右或向左，
+        # 两翼偏移量为预先计算的常量，无需逐个箭头做三角运算
+        wing_x = _ARROW_WING_X if dx >= 0 else -_ARROW_WING_X
+        wing_y = _ARROW_WING_Y if dx >= 0 else -_ARROW_WING_Y
+        path.moveTo(tx, ty)
+        path.lineTo(tx - wing_x, ty - wing_y)
+        path.moveTo(tx, ty)
+        path.lineTo(tx - wing_x, ty + wing_y)
+        
+        # 先通知场景旧的包围矩形即将失效，再更新包围矩形和路径
+        self.prepareGeometryChange()
+        self._bounds = path.boundingRect().adjusted(-5, -5, 5, 5)
+        self.setPath(path)
         
-        path.moveTo(target_pos)
-        path.lineTo(arrow_p1)
-        path.moveTo(target_pos)
-        path.lineTo(arrow_p2)
+    def detach(self):
+        """从端点节点上解除关联，箭头从场景移除前调用"""
+        self.start_node._incident_arrows.remove(self)
+        self.end_node._incident_arrows.remove(self)
         
-        self.setPath(path)
+    def boundingRect(self):
+        """返回紧贴路径的包围矩形，使视图只重绘箭头所在区域"""
+        return self._bounds
         
     def paint(self, painter, option, widget):
         """绘制箭头"""
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 设置线条样式
-        pen = QPen(QColor(100, 100, 100), 2)
-        painter.setPen(pen)
-        
-        # 绘制路径
+        painter.setPen(_ARROW_PEN)
         painter.drawPath(self.path())
 
 class FlowGraphView(QGraphicsView):
@@ -179,7 +221,7 @@ class FlowGraphView(QGraphicsView):
         super().__init__(parent)
         self.setRenderHint(QPainter.Antialiasing)
         self.setDragMode(QGraphicsView.RubberBandDrag)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
         self.setBackgroundBrush(QBrush(QColor(250, 250, 250)))
         
         # 设置场景
@@ -206,11 +248,32 @@ class FlowGraphView(QGraphicsView):
 class FlowView(ScrollArea):
     """流程图视图"""
     
+    # 场景图形项超过该数量时使用BSP树索引，否则不建立索引
+    BSP_INDEX_THRESHOLD = 300
+    
+    # 层次布局中各优先级所在的层
+    PRIORITY_LEVELS = {"紧急": 0, "高": 1, "中": 2, "低": 3}
+    
+    # 刷新请求合并的等待时间（毫秒）
+    REFRESH_DELAY = 50
+    
     def __init__(self, scheduler_manager, parent=None):
         super().__init__(parent)
         self.scheduler_manager = scheduler_manager
         self.is_updating = False  # 添加标志以防止递归
         
+        # 场景中的图形项，跨刷新复用
+        self._nodes = {}  # 任务ID -> 任务节点
+        self._arrows = {}  # (起点任务ID, 终点任务ID) -> 箭头
+        self._tasks = []  # 按开始时间排序的任务
+        self._placeholder = None  # 没有任务时的提示文本
+        
+        # 短时间内的多次刷新请求合并为一次加载
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(self.REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(self.load_tasks)
+        
         # 初始化界面
         self.init_ui()
         
@@ -271,64 +334,124 @@ class FlowView(ScrollArea):
         self.main_layout.addWidget(self.graph_view)
     
     def load_tasks(self):
-        """加载任务并创建流程图"""
+        """加载任务并增量更新流程图
+        
+        只创建新增或内容变化的任务节点，删除已不存在的节点，
+        其余节点和箭头保留并重新定位
+        """
         if self.is_updating:  # 如果已经在更新中，则直接返回
             return
             
         self.is_updating = True  # 设置更新标志
         
         try:
-            # 清除旧的图形项
-            self.graph_view.scene().clear()
+            scene = self.graph_view.scene()
             
-            # 获取所有任务
-            tasks = self.scheduler_manager.get_all_tasks()
+            # 获取按开始时间排序的所有任务（由调度管理器缓存）
+            tasks = self.scheduler_manager.get_all_tasks_sorted()
             
             if not tasks:
+                # 清除所有节点和箭头
+                for item in list(self._arrows.values()) + list(self._nodes.values()):
+                    scene.removeItem(item)
+                self._arrows.clear()
+                self._nodes.clear()
+                self._tasks = []
+                
                 # 如果没有任务，显示提示
-                text_item = self.graph_view.scene().addText("没有任务数据，请先添加任务")
-                text_item.setFont(QFont("Microsoft YaHei", 12))
-                text_item.setPos(0, 0)
+                if self._placeholder is None:
+                    self._placeholder = scene.addText("没有任务数据，请先添加任务")
+                    self._placeholder.setFont(_PLACEHOLDER_FONT)
+                    self._placeholder.setPos(0, 0)
                 return
+            
+            if self._placeholder is not None:
+                scene.removeItem(self._placeholder)
+                self._placeholder = None
                 
-            # 根据开始时间排序任务
-            tasks.sort(key=lambda x: x["start_time"])
+            self._tasks = tasks
+            
+            # 批量增删图形项期间关闭场景索引，避免每次插入都调整BSP树
+            scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+            
+            # 删除已不存在或内容已变化的任务节点
+            tasks_by_id = {task.get("id"): task for task in tasks}
+            for task_id, node in list(self._nodes.items()):
+                task = tasks_by_id.get(task_id)
+                if task is None or not node.matches(task):
+                    scene.removeItem(node)
+                    del self._nodes[task_id]
             
-            # 创建节点
-            nodes = {}
-            for task in tasks:
-                node = FlowTaskNode(task)
-                self.graph_view.scene().addItem(node)
-                nodes[task.get("id")] = node
+            # 只为新增的任务创建节点
+            for task_id, task in tasks_by_id.items():
+                if task_id not in self._nodes:
+                    node = FlowTaskNode(task, flow_view=self)
+                    scene.addItem(node)
+                    self._nodes[task_id] = node
                 
             # 按照时间顺序布局节点并添加连接线
             # 这里使用简化的布局算法，实际中可以使用更复杂的布局算法
             layout_type = self.layout_combo.currentText()
-            self.apply_layout(nodes, tasks, layout_type)
+            layout_rect = self.apply_layout(self._nodes, tasks, layout_type)
             
-            # 创建依赖关系箭头（简化：按照时间顺序连接任务）
-            for i in range(len(tasks) - 1):
-                current_node = nodes[tasks[i].get("id")]
-                next_node = nodes[tasks[i + 1].get("id")]
-                
-                arrow = FlowTaskArrow(current_node, next_node)
-                self.graph_view.scene().addItem(arrow)
+            # 依赖关系箭头（简化：按照时间顺序连接任务），以(起点任务ID, 终点任务ID)为键
+            arrow_keys = [
+                (tasks[i].get("id"), tasks[i + 1].get("id"))
+                for i in range(len(tasks) - 1)
+            ]
+            wanted = set(arrow_keys)
+            
+            # 删除不再需要或端点节点已被替换的箭头
+            for key, arrow in list(self._arrows.items()):
+                if (key not in wanted
+                        or arrow.start_node is not self._nodes[key[0]]
+                        or arrow.end_node is not self._nodes[key[1]]):
+                    arrow.detach()
+                    scene.removeItem(arrow)
+                    del self._arrows[key]
+            
+            # 新建缺少的箭头，保留的箭头已在节点移动时更新路径
+            for key in arrow_keys:
+                if key not in self._arrows:
+                    arrow = FlowTaskArrow(self._nodes[key[0]], self._nodes[key[1]])
+                    scene.addItem(arrow)
+                    self._arrows[key] = arrow
+            
+            # 图形项较多时重新建立BSP树索引，加快视口裁剪和点击查找
+            if len(self._nodes) + len(self._arrows) > self.BSP_INDEX_THRESHOLD:
+                scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
             
             # 调整视图
-            self.graph_view.setSceneRect(self.graph_view.scene().itemsBoundingRect())
-            self.graph_view.fitInView(self.graph_view.scene().sceneRect(), Qt.KeepAspectRatio)
+            self.fit_scene(layout_rect)
         finally:
             self.is_updating = False  # 清除更新标志
     
+    def fit_scene(self, rect):
+        """根据布局范围设置场景范围并缩放到适合视图
+        
+        Args:
+            rect: apply_layout返回的节点范围，箭头总在其内
+        """
+        self.graph_view.setSceneRect(rect.adjusted(-20, -20, 20, 20))
+        self.graph_view.fitInView(rect, Qt.KeepAspectRatio)
+    
     def apply_layout(self, nodes, tasks, layout_type):
-        """应用不同的布局算法"""
+        """应用不同的布局算法
+        
+        tasks需已按开始时间排序
+        
+        Returns:
+            QRectF: 所有节点占据的场景范围，由节点位置直接算出，无需遍历场景
+        """
+        # 一次性取出与任务顺序对应的节点
+        task_nodes = [nodes[task["id"]] for task in tasks]
+        
         if layout_type == "水平布局":
             # 水平布局: 任务按开始时间从左到右排列
             spacing_x = 250
             y = 50
             
-            for i, task in enumerate(tasks):
-                node = nodes[task.get("id")]
+            for i, node in enumerate(task_nodes):
                 node.setPos(i * spacing_x, y)
                 
         elif layout_type == "垂直布局":
@@ -336,44 +459,48 @@ class FlowView(ScrollArea):
             x = 50
             spacing_y = 120
             
-            for i, task in enumerate(tasks):
-                node = nodes[task.get("id")]
+            for i, node in enumerate(task_nodes):
                 node.setPos(x, i * spacing_y)
                 
         else:  # 层次布局
             # 层次布局: 按优先级和时间进行分层布局
-            priority_levels = {"紧急": 0, "高": 1, "中": 2, "低": 3}
+            priority_levels = self.PRIORITY_LEVELS
             
-            # 先按优先级分组
-            priority_groups = {}
-            for task in tasks:
-                priority = task.get("priority", "中")
-                level = priority_levels.get(priority, 2)
-                if level not in priority_groups:
-                    priority_groups[level] = []
-                priority_groups[level].append(task)
+            # 按层排序，排序是稳定的，tasks已按开始时间排序，同层内仍保持时间顺序
+            leveled = sorted(
+                ((priority_levels.get(task.get("priority", "中"), 2), node)
+                 for task, node in zip(tasks, task_nodes)),
+                key=itemgetter(0))
             
-            # 计算每组中的位置
-            x = 50
+            # 逐层计算位置
+            spacing_x = 250
             spacing_y = 120
-            for level in sorted(priority_groups.keys()):
-                group_tasks = priority_groups[level]
-                group_tasks.sort(key=lambda x: x["start_time"])
-                
+            for level, group in groupby(leveled, key=itemgetter(0)):
                 # 计算当前层的垂直起点
                 y = 50 + level * spacing_y * 1.5
                 
                 # 在当前层内水平排列
-                spacing_x = 250
-                for i, task in enumerate(group_tasks):
-                    node = nodes[task.get("id")]
+                for i, (_, node) in enumerate(group):
                     node.setPos(i * spacing_x, y)
+        
+        if not task_nodes:
+            return QRectF()
+        xs = [node.x() for node in task_nodes]
+        ys = [node.y() for node in task_nodes]
+        left, top = min(xs), min(ys)
+        return QRectF(left, top,
+                      max(xs) - left + FlowTaskNode.WIDTH,
+                      max(ys) - top + FlowTaskNode.HEIGHT)
     
     def on_layout_changed(self, index):
-        """布局方式变化事件处理"""
-        if self.is_updating:
+        """布局方式变化事件处理
+        
+        只重新定位现有节点，箭头随节点移动自动更新，不重建场景
+        """
+        if self.is_updating or not self._nodes:
             return
-        self.load_tasks()
+        
+        self.fit_scene(self.apply_layout(self._nodes, self._tasks, self.layout_combo.currentText()))
     
     def zoom_in(self):
         """放大视图"""
@@ -395,7 +522,10 @@ class FlowView(ScrollArea):
         self.graph_view.fitInView(self.graph_view.scene().sceneRect(), Qt.KeepAspectRatio)
     
     def refresh(self):
-        """刷新视图"""
+        """刷新视图
+        
+        刷新会延迟REFRESH_DELAY毫秒执行，期间的重复请求只触发一次加载
+        """
         if not self.is_updating:
-            self.load_tasks()
+            self._refresh_timer.start()
 
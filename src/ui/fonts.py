@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+字体注册模块
+集中创建自绘部件使用的字体和字体度量，整个应用共享同一批对象
+"""
+
+from PyQt5.QtGui import QFont, QFontMetricsF
+
+# 界面统一使用的字体族
+FONT_FAMILY = "Microsoft YaHei"
+
+# (字号, 是否粗体) -> QFont
+_fonts = {}
+# QFont.key() -> QFontMetricsF
+_metrics = {}
+
+
+def yahei(point_size, bold=False):
+    """获取共享的微软雅黑字体
+
+    返回的字体对象由所有调用方共享，请勿修改
+    """
+    key = (point_size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = QFont(FONT_FAMILY, point_size, QFont.Bold if bold else QFont.Normal)
+        _fonts[key] = font
+    return font
+
+
+def font_metrics(font):
+    """获取字体对应的缓存字体度量
+
+    字体度量依赖字体数据库，需要在QApplication创建之后调用
+    """
+    key = font.key()
+    metrics = _metrics.get(key)
+    if metrics is None:
+        metrics = QFontMetricsF(font)
+        _metrics[key] = metrics
+    return metrics
+
+
+# 常用字体，模块导入时创建
+YAHEI_9_BOLD = yahei(9, bold=True)
+YAHEI_9 = yahei(9)
+YAHEI_8 = yahei(8)
@@ -7,14 +7,16 @@
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+import logging
 import math
 
-from PyQt5.QtCore import Qt, QRectF, QDate, QDateTime, QSize, QPoint, pyqtSignal, QTimer, QEvent, QMimeData
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPainterPath, QDrag
+from PyQt5.QtCore import Qt, QRect, QRectF, QPointF, QLine, QDate, QDateTime, QSize, QPoint, pyqtSignal, QTimer, QEvent, QMimeData
+from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QDrag, QStaticText, QTransform, QPixmap
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, 
     QSplitter, QGridLayout, QMenu, QHeaderView, QTableWidget, 
-    QTableWidgetItem, QAbstractItemView, QFrame, QSizePolicy
+    QTableWidgetItem, QAbstractItemView, QFrame, QSizePolicy, QSpacerItem
 )
 
 from qfluentwidgets import (
@@ -24,18 +26,179 @@ from qfluentwidgets import (
 )
 
 from ui.task_dialog import TaskDialog
+from ui.fonts import font_metrics, YAHEI_8
+
+logger = logging.getLogger(__name__)
+
+
+def _static_text(text, font):
+    """创建按字体预先排版的静态文本，返回(QStaticText, 文本宽度)"""
+    static = QStaticText(text)
+    static.setTextFormat(Qt.PlainText)
+    static.prepare(QTransform(), font)
+    return static, static.size().width()
+
+
+def _task_span(task_start, task_end, start_ord):
+    """计算任务相对图表开始日期的天数跨度
+    
+    直接用日期序数做整数运算，不创建中间的date和timedelta对象
+    
+    Args:
+        task_start: 任务开始时间
+        task_end: 任务结束时间
+        start_ord: 图表开始日期的序数
+        
+    Returns:
+        tuple: (距图表开始日期的天数, 持续天数)，持续天数至少为一天
+    """
+    start = task_start.toordinal()
+    return start - start_ord, max(1, task_end.toordinal() - start + 1)
+
+
+@lru_cache(maxsize=4096)
+def _format_tooltip(title, description, task_start, task_end, status, completed, priority, today):
+    """生成任务条的工具提示文本，相同任务状态只格式化一次"""
+    # 计算剩余天数或超期天数
+    days_left = (task_end.date() - today).days
+    
+    days_info = ""
+    if not completed:
+        if days_left > 0:
+            days_info = f"\n剩余天数: {days_left}天"
+        elif days_left < 0:
+            days_info = f"\n已超期: {-days_left}天"
+        else:
+            days_info = "\n今日到期"
+    
+    completion_text = "已完成" if completed else "未完成"
+    
+    return (
+        f"<b>{title}</b>\n"
+        f"描述: {description}\n"
+        f"开始: {task_start.strftime('%Y-%m-%d %H:%M')}\n"
+        f"结束: {task_end.strftime('%Y-%m-%d %H:%M')}\n"
+        f"状态: {status}\n"
+        f"完成: {completion_text}\n"
+        f"优先级: {priority}{days_info}"
+    )
+
+
+class _DayTable:
+    """日期范围内的逐日信息
+    
+    以并列列表保存，按距开始日期的天数索引，范围变化时重建，
+    由甘特图创建后供头部和所有任务行共享，绘制时无需再做日期运算和格式化
+    """
+    
+    # 网格位图使用的颜色和画笔
+    WEEKEND_COLOR = QColor(248, 248, 248)
+    GRID_PEN = QPen(QColor(220, 220, 220), 1, Qt.SolidLine)
+    WEEKEND_GRID_PEN = QPen(QColor(220, 220, 220), 1, Qt.DotLine)
+    
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        n_days = len(self.dates)
+        
+        # 星期按开始日期的星期几依次递推，无需逐日计算
+        first_weekday = start_date.weekday()
+        self.weekdays = [(first_weekday + i) % 7 for i in range(n_days)]
+        self.is_weekend = [weekday >= 5 for weekday in self.weekdays]  # 5=周六, 6=周日
+        
+        # 连续的周末区间(起始天索引, 天数)，用于整段填充周末底色
+        # 周六每7天出现一次，每段周末为周六、周日两天，首尾按范围截断
+        self.weekend_runs = []
+        if first_weekday == 6:
+            self.weekend_runs.append((0, 1))
+        for first in range((5 - first_weekday) % 7, n_days, 7):
+            self.weekend_runs.append((first, min(2, n_days - first)))
+        
+        # 星期名称只有7种，按星期几查表，保持与strftime一致的本地化结果
+        day_names = {day.weekday(): day.strftime("%a") for day in
+                     (start_date + timedelta(days=i) for i in range(7))}
+        self.mmdd = [f"{day.month:02d}-{day.day:02d}" for day in self.dates]
+        self.dd = [f"{day.day:02d}" for day in self.dates]
+        self.aaa = [day_names[weekday] for weekday in self.weekdays]
+        self.a1 = [day_names[weekday][0] for weekday in self.weekdays]  # 星期首字母，窄列时显示
+        
+        # 任务行网格背景位图及其对应的(日宽度, 行高, 设备像素比)
+        self._grid_pixmap = None
+        self._grid_key = None
+        
+    def __len__(self):
+        return len(self.dates)
+        
+    def grid_pixmap(self, day_width, height, ratio=1.0):
+        """获取任务行的网格背景位图
+        
+        位图只包含竖线和周末底色，其余部分透明，日宽度变化时重新绘制
+        
+        Args:
+            day_width: 日宽度
+            height: 行高
+            ratio: 设备像素比
+        """
+        key = (day_width, height, ratio)
+        if self._grid_key != key:
+            width = int(math.ceil(len(self.dates) * day_width)) + 1
+            pixmap = QPixmap(int(math.ceil(width * ratio)), int(math.ceil(height * ratio)))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            
+            # 每段连续周末只填充一次底色
+            for first, count in self.weekend_runs:
+                left = int(first * day_width)
+                painter.fillRect(left, 0, int((first + count) * day_width) - left, height,
+                                 self.WEEKEND_COLOR)
+            
+            # 所有竖线一次绘制，周末的竖线再叠加虚线
+            lines = [QLine(int(index * day_width), 0, int(index * day_width), height)
+                     for index in range(len(self.dates))]
+            painter.setPen(self.GRID_PEN)
+            painter.drawLines(lines)
+            painter.setPen(self.WEEKEND_GRID_PEN)
+            painter.drawLines([line for line, weekend in zip(lines, self.is_weekend) if weekend])
+            painter.end()
+            
+            self._grid_pixmap = pixmap
+            self._grid_key = key
+        return self._grid_pixmap
 
 class GanttHeaderWidget(QWidget):
     """甘特图头部日期栏"""
     
-    def __init__(self, start_date, end_date, day_width=30, parent=None):
+    # 日期文本字体
+    FONT = YAHEI_8
+    # 绘制用的画笔，所有实例共享
+    GRID_PEN = QPen(QColor(200, 200, 200))
+    TEXT_PEN = QPen(QColor(0, 0, 0))
+    WEEKEND_PEN = QPen(QColor(220, 20, 60))  # 红色
+    TODAY_PEN = QPen(QColor(255, 0, 0), 1, Qt.DashLine)
+    
+    def __init__(self, start_date, end_date, day_width=30, parent=None, day_table=None, chart=None):
         super().__init__(parent)
+        self._chart = chart  # 所属甘特图
         self.start_date = start_date
         self.end_date = end_date
         self.day_width = day_width
         self.min_day_width = 20  # 最小日期宽度
         self.max_day_width = 100  # 最大日期宽度
         
+        # 逐日信息，通常由甘特图传入共享
+        self.day_table = day_table if day_table is not None else _DayTable(start_date, end_date)
+        
+        # 天索引 -> 该日各种格式的静态文本，与日宽度无关，首次绘制到该日时创建
+        self._static_cache = [None] * len(self.day_table)
+        
+        # drawStaticText以文本左上角定位，换算出两行文本基线20和40对应的顶部位置
+        ascent = font_metrics(self.FONT).ascent()
+        self._text_tops = (20 - ascent, 40 - ascent)
+        
         # 计算天数
         self.days = (end_date - start_date).days + 1
         
@@ -46,12 +209,31 @@ class GanttHeaderWidget(QWidget):
         self.setFixedWidth(int(self.total_width))
         self.setFixedHeight(50)
         
+        # 连续缩放时只应用最后一次的日宽度，在下一次事件循环中统一更新
+        self._pending_width = None
+        self._width_timer = QTimer(self)
+        self._width_timer.setSingleShot(True)
+        self._width_timer.setInterval(0)
+        self._width_timer.timeout.connect(self._apply_width)
+        
     def updateDayWidth(self, new_width):
         """更新日宽度并重新计算总宽度
         
+        更新会推迟到下一次事件循环，期间多次调用只生效最后一次
+        
         Args:
             new_width: 新的日宽度
         """
+        self._pending_width = new_width
+        self._width_timer.start()
+        
+    def _apply_width(self):
+        """应用待更新的日宽度"""
+        new_width = self._pending_width
+        self._pending_width = None
+        if new_width is None:
+            return
+        
         # 更新日宽度
         self.day_width = min(self.max_day_width, max(self.min_day_width, new_width))
         
@@ -69,93 +251,91 @@ class GanttHeaderWidget(QWidget):
         # 我们现在不在resize事件中改变day_width，而是通过updateDayWidth方法来控制
         super().resizeEvent(event)
         
+    def _day_texts(self, index):
+        """获取第index天的静态文本
+        
+        Returns:
+            tuple: (月-日, 日, 星期, 星期首字母)，每项为(QStaticText, 文本宽度)
+        """
+        texts = self._static_cache[index]
+        if texts is None:
+            table = self.day_table
+            texts = tuple(
+                _static_text(text, self.FONT)
+                for text in (table.mmdd[index], table.dd[index], table.aaa[index], table.a1[index])
+            )
+            self._static_cache[index] = texts
+        return texts
+        
     def paintEvent(self, event):
         """绘制日期头部"""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
         # 设置字体
-        font = QFont("Microsoft YaHei", 8)
-        painter.setFont(font)
-        
-        # 获取滚动偏移量 - 从父组件中获取
-        scroll_offset = 0
-        parent = self.parent()
-        while parent:
-            if isinstance(parent, GanttChart) and parent.horizontalScrollBar():
-                scroll_offset = parent.horizontalScrollBar().value()
-                break
-            parent = parent.parent()
+        painter.setFont(self.FONT)
         
-        # 获取日期范围
-        current_date = self.start_date
+        # 两行文本的顶部位置
+        top1, top2 = self._text_tops
         
-        # 计算绘制起始位置，考虑滚动偏移量
-        start_x = -scroll_offset
+        # 获取滚动偏移量 - 从所属甘特图中获取
+        scroll_offset = self._chart.horizontalScrollBar().value() if self._chart is not None else 0
         
-        # 确定起始日期索引，避免绘制不可见的日期
-        if scroll_offset > 0:
-            days_to_skip = int(scroll_offset / self.day_width)
-            if days_to_skip > 0:
-                current_date += timedelta(days=days_to_skip)
-                start_x += days_to_skip * self.day_width
+        # 确定可见的第一天，避免绘制不可见的日期
+        day_width = self.day_width
+        first = int(scroll_offset / day_width) if scroll_offset > 0 else 0
         
         # 计算可见区域能显示的天数
         visible_width = self.width()
-        days_to_show = int(visible_width / self.day_width) + 2  # 多显示2天确保边界平滑
+        days_to_show = int(visible_width / day_width) + 2  # 多显示2天确保边界平滑
+        last = min(len(self.day_table), first + days_to_show)
         
-        # 绘制可见区域的日期
-        x = start_x
-        day_count = 0
+        # 局部重绘时只绘制与重绘区域相交的日期，左侧多留一天以免文本被截断
+        clip = event.rect()
+        first = max(first, int((clip.left() + scroll_offset) / day_width) - 1)
+        last = min(last, int((clip.right() + scroll_offset) / day_width) + 1)
+        is_weekend = self.day_table.is_weekend
+        height = self.height()
         
-        while current_date <= self.end_date and day_count < days_to_show:
+        # 绘制可见区域的日期
+        for index in range(first, last):
+            x = index * day_width - scroll_offset
+            
             # 绘制日期分隔线
-            painter.setPen(QPen(QColor(200, 200, 200)))
-            painter.drawLine(int(x), 0, int(x), self.height())
+            painter.setPen(self.GRID_PEN)
+            painter.drawLine(int(x), 0, int(x), height)
             
-            # 绘制日期文本
-            date_str = current_date.strftime("%m-%d")
-            day_str = current_date.strftime("%a")
+            # 取出预先排版的日期文本
+            (date_text, date_w), (dd_text, dd_w), (day_text, _), (abbr_text, abbr_w) = \
+                self._day_texts(index)
             
             # 周末使用不同颜色
-            if current_date.weekday() >= 5:  # 5=周六, 6=周日
-                painter.setPen(QPen(QColor(220, 20, 60)))  # 红色
-            else:
-                painter.setPen(QPen(QColor(0, 0, 0)))
+            painter.setPen(self.WEEKEND_PEN if is_weekend[index] else self.TEXT_PEN)
                 
             # 绘制日期
             # 当日期宽度小于阈值时显示简化格式
-            if self.day_width < 35:
+            if day_width < 35:
                 # 简化日期格式，只显示日
-                date_str = current_date.strftime("%d")
-                painter.drawText(int(x + (self.day_width - painter.fontMetrics().width(date_str)) / 2), 
-                               20, date_str)
+                painter.drawStaticText(QPointF(int(x + (day_width - dd_w) / 2), top1), dd_text)
                 
                 # 不显示星期
-                if self.day_width >= 25:  # 宽度稍大时尝试显示简化星期
-                    day_abbr = current_date.strftime("%a")[0]  # 只取第一个字母
-                    painter.drawText(int(x + (self.day_width - painter.fontMetrics().width(day_abbr)) / 2), 
-                                  40, day_abbr)
+                if day_width >= 25:  # 宽度稍大时尝试显示简化星期
+                    painter.drawStaticText(QPointF(int(x + (day_width - abbr_w) / 2), top2), abbr_text)
             else:
                 # 正常显示
-                painter.drawText(int(x + 5), 20, date_str)
-                painter.drawText(int(x + 5), 40, day_str)
-            
-            # 移动到下一天
-            current_date += timedelta(days=1)
-            x += self.day_width
-            day_count += 1
+                painter.drawStaticText(QPointF(int(x + 5), top1), date_text)
+                painter.drawStaticText(QPointF(int(x + 5), top2), day_text)
             
         # 绘制今天的指示线
-        today = datetime.now().date()
+        today = self._chart.today if self._chart is not None else datetime.now().date()
         if self.start_date <= today <= self.end_date:
             days_from_start = (today - self.start_date).days
             today_x = days_from_start * self.day_width - scroll_offset
             
-            # 只在可见区域内绘制今日线
-            if 0 <= today_x <= visible_width:
-                painter.setPen(QPen(QColor(255, 0, 0), 1, Qt.DashLine))
-                painter.drawLine(int(today_x), 0, int(today_x), self.height())
+            # 只在可见区域和重绘区域内绘制今日线
+            if 0 <= today_x <= visible_width and clip.left() <= today_x <= clip.right() + 1:
+                painter.setPen(self.TODAY_PEN)
+                painter.drawLine(int(today_x), 0, int(today_x), height)
 
 class GanttTaskBar(QWidget):
     """甘特图中的任务条"""
@@ -164,8 +344,30 @@ class GanttTaskBar(QWidget):
     dragMoved = pyqtSignal(dict, int)  # 拖动任务时发出信号，包含任务数据和水平偏移量
     resized = pyqtSignal(dict, int, bool)  # 调整大小时发出信号，包含任务数据、天数变化、是否调整开始日期
     
-    def __init__(self, task_data, start_date, day_width=30, parent=None):
+    # 优先级 -> 任务条底色
+    PRIORITY_COLORS = {
+        "低": QColor(76, 175, 80),  # 绿色
+        "中": QColor(33, 150, 243),  # 蓝色
+        "高": QColor(255, 152, 0),  # 橙色
+        "紧急": QColor(244, 67, 54),  # 红色
+    }
+    # 底色 -> (悬停底色, 进度底色, 悬停进度底色)，按需生成后共享
+    _shade_cache = {}
+    
+    # 文本字体和画笔
+    FONT = YAHEI_8
+    TEXT_PEN = QPen(QColor(255, 255, 255))
+    # 边框画笔：拖拽、悬停、普通
+    DRAG_BORDER_PEN = QPen(QColor(255, 255, 255), 2, Qt.DashLine)
+    HOVER_BORDER_PEN = QPen(QColor(255, 255, 255), 1.5)
+    BORDER_PEN = QPen(QColor(255, 255, 255, 150), 1)
+    
+    # 拖拽和调整大小时应用几何变化的最小间隔（毫秒）
+    DRAG_UPDATE_INTERVAL = 8
+    
+    def __init__(self, task_data, start_date, day_width=30, parent=None, chart=None):
         super().__init__(parent)
+        self._chart = chart  # 所属甘特图
         self.task_data = task_data
         self.start_date = start_date
         self.day_width = day_width
@@ -179,35 +381,27 @@ class GanttTaskBar(QWidget):
         self.last_position = 0  # 最后位置，用于计算变化量
         self.last_width = 0  # 最后宽度，用于计算变化量
         self.resize_margin = 5  # 调整大小的边缘宽度
+        self._start_ord = start_date.toordinal()  # 图表开始日期的序数
+        self._span_key = None  # 计算跨度时使用的(开始时间, 结束时间)
+        self._span = (0, 1)  # (距图表开始日期的天数, 持续天数)
+        
+        # 拖拽和调整大小时只记录最新的几何，按固定间隔应用，避免每次鼠标移动都重排重绘
+        self._pending_geometry = None
+        self._geometry_timer = QTimer(self)
+        self._geometry_timer.setSingleShot(True)
+        self._geometry_timer.setInterval(self.DRAG_UPDATE_INTERVAL)
+        self._geometry_timer.timeout.connect(self._apply_pending_geometry)
+        
         self.init_ui()
         
     def init_ui(self):
         """初始化界面"""
         # 计算任务条位置和大小
-        task_start = self.task_data.get("start_time")
-        task_end = self.task_data.get("end_time")
-        
-        # 计算开始位置 - 确保精确对齐到网格
-        days_from_start = (task_start.date() - self.start_date).days
-        start_offset = days_from_start * self.day_width
-        
-        # 计算持续时间宽度（至少一天）
-        duration_days = max(1, (task_end.date() - task_start.date()).days + 1)
-        width = duration_days * self.day_width
-        
-        # 设置位置和大小 - 使用精确计算结果
-        self.setGeometry(int(start_offset), 5, int(width), 25)
+        self.update_geometry()
         
         # 根据优先级设置颜色
         priority = self.task_data.get("priority", "中")
-        if priority == "低":
-            self.bg_color = QColor(76, 175, 80)  # 绿色
-        elif priority == "中":
-            self.bg_color = QColor(33, 150, 243)  # 蓝色
-        elif priority == "高":
-            self.bg_color = QColor(255, 152, 0)  # 橙色
-        else:  # 紧急
-            self.bg_color = QColor(244, 67, 54)  # 红色
+        self.bg_color = self.PRIORITY_COLORS.get(priority, self.PRIORITY_COLORS["紧急"])
             
         # 启用鼠标跟踪
         self.setMouseTracking(True)
@@ -215,45 +409,86 @@ class GanttTaskBar(QWidget):
         # 设置工具提示
         self.update_tooltip()
         
-    def update_tooltip(self):
-        """更新工具提示"""
+    def _day_span(self):
+        """获取任务条的天数跨度，任务时间不变时复用上次的结果
+        
+        Returns:
+            tuple: (距图表开始日期的天数, 持续天数)
+        """
         task_start = self.task_data.get("start_time")
         task_end = self.task_data.get("end_time")
-        completed = self.task_data.get("completed", False)
-        status = self.task_data.get("status", "未开始")
-        priority = self.task_data.get("priority", "中")
+        key = (task_start, task_end)
+        if key != self._span_key:
+            self._span = _task_span(task_start, task_end, self._start_ord)
+            self._span_key = key
+        return self._span
         
-        # 计算剩余天数或超期天数
-        today = datetime.now().date()
-        end_date = task_end.date()
-        days_left = (end_date - today).days
-        
-        days_info = ""
-        if not completed:
-            if days_left > 0:
-                days_info = f"\n剩余天数: {days_left}天"
-            elif days_left < 0:
-                days_info = f"\n已超期: {-days_left}天"
-            else:
-                days_info = "\n今日到期"
+    def update_geometry(self, day_width=None):
+        """按日宽度设置任务条的位置和大小
         
-        completion_text = "已完成" if completed else "未完成"
+        缩放时任务时间不变，只需用缓存的天数跨度乘以新的日宽度
         
-        self.setToolTip(
-            f"<b>{self.task_data.get('title')}</b>\n"
-            f"描述: {self.task_data.get('description')}\n"
-            f"开始: {task_start.strftime('%Y-%m-%d %H:%M')}\n"
-            f"结束: {task_end.strftime('%Y-%m-%d %H:%M')}\n"
-            f"状态: {status}\n"
-            f"完成: {completion_text}\n"
-            f"优先级: {priority}{days_info}"
-        )
+        Args:
+            day_width: 可选，新的日宽度，未提供时使用当前日宽度
+        """
+        if day_width is not None:
+            self.day_width = day_width
+        days_from_start, duration_days = self._day_span()
+        
+        # 设置位置和大小 - 确保精确对齐到网格
+        self.setGeometry(int(days_from_start * self.day_width), 5,
+                         int(duration_days * self.day_width), 25)
+        
+    def _defer_geometry(self, rect):
+        """记录拖拽中的新几何，定时器未运行时启动，运行期间只更新待应用的几何"""
+        self._pending_geometry = rect
+        if not self._geometry_timer.isActive():
+            self._geometry_timer.start()
+        
+    def _apply_pending_geometry(self):
+        """应用最后一次记录的拖拽几何"""
+        rect = self._pending_geometry
+        self._pending_geometry = None
+        if rect is not None:
+            self.setGeometry(rect)
+        
+    def _today(self):
+        """获取今天的日期，优先使用甘特图缓存的日期"""
+        return self._chart.today if self._chart is not None else datetime.now().date()
+        
+    def update_tooltip(self):
+        """更新工具提示"""
+        task_data = self.task_data
+        self.setToolTip(_format_tooltip(
+            task_data.get("title"),
+            task_data.get("description"),
+            task_data.get("start_time"),
+            task_data.get("end_time"),
+            task_data.get("status", "未开始"),
+            task_data.get("completed", False),
+            task_data.get("priority", "中"),
+            self._today()
+        ))
+        
+    @classmethod
+    def _shades(cls, color):
+        """获取底色对应的悬停色和进度色"""
+        key = color.rgba()
+        shades = cls._shade_cache.get(key)
+        if shades is None:
+            hover = color.lighter(110)
+            shades = (hover, color.darker(120), hover.darker(120))
+            cls._shade_cache[key] = shades
+        return shades
         
     def paintEvent(self, event):
         """绘制任务条"""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
+        # 需要重绘的区域，局部更新时跳过与之不相交的部分
+        clip = event.rect()
+        
         # 任务完成状态
         completed = self.task_data.get("completed", False)
         
@@ -262,65 +497,61 @@ class GanttTaskBar(QWidget):
         if completed:
             progress = 100
         
-        # 绘制任务背景
-        path = QPainterPath()
-        path.addRoundedRect(QRectF(self.rect()), 3, 3)
-        
         # 悬停效果
+        hover_color, progress_color, hover_progress_color = self._shades(self.bg_color)
         bg_color = self.bg_color
         if self.hover:
-            bg_color = bg_color.lighter(110)
+            bg_color = hover_color
+            progress_color = hover_progress_color
             
-        painter.fillPath(path, bg_color)
+        # 绘制任务背景，直接绘制圆角矩形，无需构造QPainterPath
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(bg_color)
+        painter.drawRoundedRect(self.rect(), 3, 3)
         
         # 绘制进度条背景
-        if progress > 0:
-            progress_width = (progress / 100.0) * self.width()
-            progress_rect = QRectF(0, 0, progress_width, self.height())
-            progress_path = QPainterPath()
-            progress_path.addRoundedRect(progress_rect, 3, 3)
-            
-            # 调整进度条颜色
-            progress_color = bg_color.darker(120)
-            painter.fillPath(progress_path, progress_color)
-        
-        # 绘制文本
-        painter.setPen(QPen(QColor(255, 255, 255)))
-        painter.setFont(QFont("Microsoft YaHei", 8))
+        # 任务条按整像素对齐，进度宽度同样取整数
+        progress_width = int(progress * self.width()) // 100
+        if progress_width > 0 and clip.left() <= progress_width:
+            painter.setBrush(progress_color)
+            painter.drawRoundedRect(QRect(0, 0, progress_width, self.height()), 3, 3)
         
-        # 获取任务标题
-        title = self.task_data.get("title", "")
-        
-        # 计算文本可见宽度
-        visible_width = self.width() - 10
-        
-        # 在进度上叠加文本
-        text_rect = QRectF(5, 0, visible_width, self.height())
-        
-        # 添加任务完成图标
-        display_text = title
-        if completed:
-            display_text = "✓ " + display_text
+        # 计算文本可见宽度，在进度上叠加文本
+        text_rect = QRect(5, 0, self.width() - 10, self.height())
         
-        # 添加天数提示
-        today = datetime.now().date()
-        end_date = self.task_data.get("end_time").date()
-        days_left = (end_date - today).days
-        
-        # 如果任务未完成且逾期，添加警告图标
-        if not completed and days_left < 0:
-            display_text = "⚠ " + display_text
+        # 绘制文本，长标题会超出文本区域右侧，因此只在重绘区域位于文本左边界以左时跳过
+        if clip.right() >= text_rect.left():
+            painter.setPen(self.TEXT_PEN)
+            painter.setFont(self.FONT)
+            
+            # 获取任务标题
+            title = self.task_data.get("title", "")
+            
+            # 添加任务完成图标
+            display_text = title
+            if completed:
+                display_text = "✓ " + display_text
             
-        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, display_text)
+            # 添加天数提示
+            today = self._today()
+            end_date = self.task_data.get("end_time").date()
+            days_left = (end_date - today).days
+            
+            # 如果任务未完成且逾期，添加警告图标
+            if not completed and days_left < 0:
+                display_text = "⚠ " + display_text
+            
+            painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, display_text)
         
         # 绘制边框，拖拽时边框更明显
         if self.dragging:
-            painter.setPen(QPen(QColor(255, 255, 255), 2, Qt.DashLine))
+            painter.setPen(self.DRAG_BORDER_PEN)
         elif self.hover:
-            painter.setPen(QPen(QColor(255, 255, 255), 1.5))
+            painter.setPen(self.HOVER_BORDER_PEN)
         else:
-            painter.setPen(QPen(QColor(255, 255, 255, 150), 1))
+            painter.setPen(self.BORDER_PEN)
             
+        painter.setBrush(Qt.NoBrush)
         painter.drawRoundedRect(self.rect().adjusted(0, 0, -1, -1), 3, 3)
         
     def enterEvent(self, event):
@@ -361,7 +592,7 @@ class GanttTaskBar(QWidget):
                 new_width = self.original_x + self.original_width - new_x
             
             # 更新位置和大小
-            self.setGeometry(int(new_x), self.y(), int(new_width), self.height())
+            self._defer_geometry(QRect(int(new_x), self.y(), int(new_width), self.height()))
             self.last_position = new_x  # 保存最后位置用于释放时计算
                 
         elif self.resize_right:
@@ -384,7 +615,7 @@ class GanttTaskBar(QWidget):
                 new_width = grid_width
             
             # 更新大小
-            self.setGeometry(self.x(), self.y(), int(new_width), self.height())
+            self._defer_geometry(QRect(self.x(), self.y(), int(new_width), self.height()))
             self.last_width = new_width  # 保存最后宽度用于释放时计算
                 
         elif self.dragging:
@@ -406,7 +637,7 @@ class GanttTaskBar(QWidget):
                 new_x = grid_position
                 
             # 更新位置
-            self.move(int(new_x), self.y())
+            self._defer_geometry(QRect(int(new_x), self.y(), self.width(), self.height()))
             self.last_position = new_x  # 保存最后位置用于释放时计算
                 
         elif event.buttons() == Qt.NoButton:
@@ -452,6 +683,10 @@ class GanttTaskBar(QWidget):
     def mouseReleaseEvent(self, event):
         """处理鼠标释放事件"""
         if event.button() == Qt.LeftButton:
+            # 先应用尚未生效的拖拽几何，避免定时器随后覆盖释放后的位置
+            self._geometry_timer.stop()
+            self._apply_pending_geometry()
+            
             was_dragging = self.dragging
             was_resizing_left = self.resize_left
             was_resizing_right = self.resize_right
@@ -466,7 +701,7 @@ class GanttTaskBar(QWidget):
                 
                 # 只有当实际移动了才发出信号
                 if days_moved != 0:
-                    print(f"拖动完成: 移动了 {days_moved} 天")
+                    logger.debug("拖动完成: 移动了 %d 天", days_moved)
                     self.dragMoved.emit(self.task_data, days_moved)
             
             elif was_resizing_left:
@@ -478,7 +713,7 @@ class GanttTaskBar(QWidget):
                 
                 # 只有当实际调整了大小才发出信号
                 if days_changed != 0:
-                    print(f"左侧调整完成: 变化了 {days_changed} 天")
+                    logger.debug("左侧调整完成: 变化了 %d 天", days_changed)
                     self.resized.emit(self.task_data, days_changed, True)
                     
             elif was_resizing_right:
@@ -490,7 +725,7 @@ class GanttTaskBar(QWidget):
                 
                 # 只有当实际调整了大小才发出信号
                 if days_changed != 0:
-                    print(f"右侧调整完成: 变化了 {days_changed} 天")
+                    logger.debug("右侧调整完成: 变化了 %d 天", days_changed)
                     self.resized.emit(self.task_data, days_changed, False)
             
             # 重置状态
@@ -520,12 +755,26 @@ class GanttTaskRow(QWidget):
     dragEntered = pyqtSignal(object)  # 拖拽进入信号，传递行对象
     taskOrderChanged = pyqtSignal(dict, int)  # 任务顺序变化信号，传递任务数据和新顺序
     
-    def __init__(self, task_data, start_date, end_date, day_width=30, parent=None):
+    # 行背景色和底边画笔
+    DROP_TARGET_COLOR = QColor(230, 242, 255)
+    CRITICAL_COLOR = QColor(255, 240, 240)
+    EVEN_ROW_COLOR = QColor(245, 245, 245)
+    ODD_ROW_COLOR = QColor(255, 255, 255)
+    BORDER_PEN = QPen(QColor(200, 200, 200))
+    # 垂直拖拽时拖拽图像的最大宽度
+    DRAG_PIXMAP_WIDTH = 200
+    # 行高
+    HEIGHT = 35
+    
+    def __init__(self, task_data, start_date, end_date, day_width=30, parent=None, day_table=None, chart=None):
         super().__init__(parent)
+        self._chart = chart  # 所属甘特图
         self.task_data = task_data
         self.start_date = start_date
         self.end_date = end_date
         self.day_width = day_width
+        # 逐日信息，通常由甘特图传入共享
+        self.day_table = day_table if day_table is not None else _DayTable(start_date, end_date)
         self.dragging = False  # 水平拖拽标记
         self.vertical_dragging = False  # 垂直拖拽标记
         self.drag_start_y = 0  # 垂直拖拽起始位置
@@ -533,9 +782,10 @@ class GanttTaskRow(QWidget):
         
         # 计算总天数
         self.days = (end_date - start_date).days + 1
+        self._start_ord = start_date.toordinal()  # 开始日期的序数，计算任务条位置时使用
         
         # 设置固定高度和最小宽度
-        self.setFixedHeight(35)
+        self.setFixedHeight(self.HEIGHT)
         self.setMinimumWidth(int(self.days * self.day_width))
         
         # 设置鼠标跟踪
@@ -545,7 +795,7 @@ class GanttTaskRow(QWidget):
         self.setAcceptDrops(True)
         
         # 添加任务条
-        self.task_bar = GanttTaskBar(task_data, start_date, day_width, self)
+        self.task_bar = GanttTaskBar(task_data, start_date, day_width, self, chart=chart)
         
         # 连接信号
         self.task_bar.clicked.connect(self.on_task_clicked)
@@ -559,21 +809,9 @@ class GanttTaskRow(QWidget):
         
         # 更新任务条位置和大小
         if self.task_bar:
-            # 计算任务条开始位置
-            task_start = self.task_data.get("start_time")
-            task_end = self.task_data.get("end_time")
-            
-            # 精确计算开始位置
-            days_from_start = (task_start.date() - self.start_date).days
-            start_offset = days_from_start * self.day_width
-            
-            # 精确计算持续时间宽度（至少一天）
-            duration_days = max(1, (task_end.date() - task_start.date()).days + 1)
-            width = duration_days * self.day_width
-            
-            # 更新任务条几何属性 - 使用精确的计算结果
-            self.task_bar.setGeometry(int(start_offset), 5, int(width), 25)
-            self.task_bar.day_width = self.day_width
+            # 任务更新后行会换用新的任务数据，任务条按同一份数据计算位置
+            self.task_bar.task_data = self.task_data
+            self.task_bar.update_geometry(self.day_width)
             
             # 确保任务条正确显示 - 这是一个强制绘制
             self.task_bar.update()
@@ -581,22 +819,23 @@ class GanttTaskRow(QWidget):
         # 更新网格线和背景
         self.update()
         
+    def _place_task_bar(self, task_start, task_end):
+        """按给定的开始和结束时间放置任务条，任务数据更新前先给出即时反馈"""
+        days_from_start, duration_days = _task_span(task_start, task_end, self._start_ord)
+        self.task_bar.setGeometry(int(days_from_start * self.day_width), 5,
+                                  int(duration_days * self.day_width), 25)
+        
     def on_task_clicked(self, task_data):
-        """当任务被点击时，查找GanttChart并调用其edit_task方法"""
-        # 查找GanttChart父级
-        parent = self.parent()
-        while parent and not isinstance(parent, GanttChart):
-            parent = parent.parent()
-            
-        if parent and isinstance(parent, GanttChart):
-            parent.edit_task(task_data)
+        """当任务被点击时，调用所属GanttChart的edit_task方法"""
+        if self._chart is not None:
+            self._chart.edit_task(task_data)
     
     def on_task_drag_moved(self, task_data, days_moved):
         """处理任务拖拽移动"""
         if days_moved == 0:
             return
         
-        print(f"甘特图行: 任务拖动 {days_moved} 天，任务ID = {task_data.get('id')}")
+        logger.debug("甘特图行: 任务拖动 %d 天，任务ID = %s", days_moved, task_data.get("id"))
         
         # 创建任务数据副本
         updated_task = task_data.copy()
@@ -611,36 +850,23 @@ class GanttTaskRow(QWidget):
         updated_task["start_time"] = new_start
         updated_task["end_time"] = new_end
         
-        print(f"  新开始时间: {new_start}")
-        print(f"  新结束时间: {new_end}")
+        logger.debug("  新开始时间: %s，新结束时间: %s", new_start, new_end)
         
         # 先更新任务条位置，以便用户有即时反馈
-        # 精确计算任务条新位置
-        days_from_start = (new_start.date() - self.start_date).days
-        start_offset = days_from_start * self.day_width
-        
-        # 精确计算任务条宽度
-        duration_days = max(1, (new_end.date() - new_start.date()).days + 1)
-        width = duration_days * self.day_width
+        self._place_task_bar(new_start, new_end)
         
-        # 使用精确计算的结果更新位置
-        self.task_bar.setGeometry(int(start_offset), 5, int(width), 25)
-        
-        # 查找GanttChart并更新任务
-        parent = self.parent()
-        while parent and not isinstance(parent, GanttChart):
-            parent = parent.parent()
-            
-        if parent and isinstance(parent, GanttChart):
+        # 通过所属GanttChart更新任务
+        if self._chart is not None:
             # 更新任务数据 - 这里将间接触发日历视图更新
-            parent.update_task(updated_task)
+            self._chart.update_task(updated_task)
     
     def on_task_resized(self, task_data, days_changed, is_start_date):
         """处理任务调整大小事件"""
         if days_changed == 0:
             return
             
-        print(f"甘特图行: 任务调整大小 {days_changed} 天，调整{'开始' if is_start_date else '结束'}时间，任务ID = {task_data.get('id')}")
+        logger.debug("甘特图行: 任务调整大小 %d 天，调整%s时间，任务ID = %s",
+                     days_changed, "开始" if is_start_date else "结束", task_data.get("id"))
             
         # 创建任务数据副本
         updated_task = task_data.copy()
@@ -653,48 +879,26 @@ class GanttTaskRow(QWidget):
             # 调整开始日期
             new_start = start_time - timedelta(days=days_changed)
             updated_task["start_time"] = new_start
-            print(f"  新开始时间: {new_start}")
+            logger.debug("  新开始时间: %s", new_start)
             
             # 先更新任务条的视觉效果，提供即时反馈
-            # 精确计算新位置
-            days_from_start = (new_start.date() - self.start_date).days
-            start_offset = days_from_start * self.day_width
-            
-            # 精确计算新宽度
-            duration_days = max(1, (end_time.date() - new_start.date()).days + 1)
-            width = duration_days * self.day_width
-            
-            # 使用精确计算的结果更新位置和大小
-            self.task_bar.setGeometry(int(start_offset), 5, int(width), 25)
+            self._place_task_bar(new_start, end_time)
         else:
             # 调整结束日期
             new_end = end_time + timedelta(days=days_changed)
             updated_task["end_time"] = new_end
-            print(f"  新结束时间: {new_end}")
+            logger.debug("  新结束时间: %s", new_end)
             
-            # 先更新任务条的视觉效果，提供即时反馈
-            # 精确计算新位置（开始位置不变）
-            days_from_start = (start_time.date() - self.start_date).days
-            start_offset = days_from_start * self.day_width
-            
-            # 精确计算新宽度
-            duration_days = max(1, (new_end.date() - start_time.date()).days + 1)
-            width = duration_days * self.day_width
-            
-            # 使用精确计算的结果更新大小
-            self.task_bar.setGeometry(int(start_offset), 5, int(width), 25)
+            # 先更新任务条的视觉效果，提供即时反馈（开始位置不变）
+            self._place_task_bar(start_time, new_end)
         
         # 强制更新任务条显示
         self.task_bar.update()
         
-        # 查找GanttChart并更新任务
-        parent = self.parent()
-        while parent and not isinstance(parent, GanttChart):
-            parent = parent.parent()
-            
-        if parent and isinstance(parent, GanttChart):
+        # 通过所属GanttChart更新任务
+        if self._chart is not None:
             # 更新任务数据 - 这里将间接触发日历视图更新
-            parent.update_task(updated_task)
+            self._chart.update_task(updated_task)
 
     def mousePressEvent(self, event):
         """处理鼠标按下事件，用于垂直拖拽任务行"""
@@ -719,8 +923,10 @@ class GanttTaskRow(QWidget):
             mime_data.setText(str(self.task_data.get("id")))
             drag.setMimeData(mime_data)
             
-            # 创建行的半透明图像作为拖拽时的视觉反馈
-            pixmap = self.grab()
+            # 创建半透明图像作为拖拽时的视觉反馈，只截取任务条附近的一段，避免渲染整行
+            width = min(self.DRAG_PIXMAP_WIDTH, self.width())
+            left = min(max(0, self.task_bar.x() if self.task_bar else 0), self.width() - width)
+            pixmap = self.grab(QRect(left, 0, width, self.height()))
             pixmap.setDevicePixelRatio(2.0)  # 提高清晰度
             painter = QPainter(pixmap)
             painter.setCompositionMode(QPainter.CompositionMode_DestinationIn)
@@ -766,13 +972,9 @@ class GanttTaskRow(QWidget):
             # 目标位置是当前行的索引
             target_position = self.task_data.get("row_index")
             
-            # 查找GanttChart并更新任务顺序
-            parent = self.parent()
-            while parent and not isinstance(parent, GanttChart):
-                parent = parent.parent()
-                
-            if parent and isinstance(parent, GanttChart):
-                parent.reorder_tasks(source_task_id, target_position)
+            # 通过所属GanttChart更新任务顺序
+            if self._chart is not None:
+                self._chart.reorder_tasks(source_task_id, target_position)
             
             # 取消高亮显示
             self.highlight_as_drop_target = False
@@ -786,48 +988,43 @@ class GanttTaskRow(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
+        # 只绘制需要重绘的区域，局部更新的开销与更新区域大小成正比
+        clip = event.rect()
+        
         # 绘制背景
         if self.highlight_as_drop_target:
             # 拖拽目标高亮
-            painter.fillRect(0, 0, self.width(), self.height(), QColor(230, 242, 255))
-        elif self.task_data.get("is_critical_path", False) and self.parent().parent().show_critical_path:
+            painter.fillRect(clip, self.DROP_TARGET_COLOR)
+        elif (self.task_data.get("is_critical_path", False)
+              and self._chart is not None and self._chart.show_critical_path):
             # 关键路径高亮
-            painter.fillRect(0, 0, self.width(), self.height(), QColor(255, 240, 240))
+            painter.fillRect(clip, self.CRITICAL_COLOR)
         elif self.task_data.get("row_index", 0) % 2 == 0:
             # 偶数行背景色
-            painter.fillRect(0, 0, self.width(), self.height(), QColor(245, 245, 245))
+            painter.fillRect(clip, self.EVEN_ROW_COLOR)
         else:
             # 奇数行背景色
-            painter.fillRect(0, 0, self.width(), self.height(), QColor(255, 255, 255))
+            painter.fillRect(clip, self.ODD_ROW_COLOR)
         
-        # 绘制网格线
-        painter.setPen(QPen(QColor(220, 220, 220)))
-        current_date = self.start_date
-        x = 0
-        
-        while current_date <= self.end_date:
-            # 绘制竖线
-            painter.setPen(QPen(QColor(220, 220, 220), 1, Qt.SolidLine))
-            painter.drawLine(int(x), 0, int(x), self.height())
-            
-            # 周末特殊处理
-            if current_date.weekday() >= 5:  # 5=周六, 6=周日
-                painter.setPen(QPen(QColor(240, 240, 240)))
-                painter.fillRect(int(x), 0, int(self.day_width), self.height(), QColor(248, 248, 248))
-                painter.setPen(QPen(QColor(220, 220, 220), 1, Qt.DotLine))
-                painter.drawLine(int(x), 0, int(x), self.height())
-            
-            # 移动到下一天
-            current_date += timedelta(days=1)
-            x += self.day_width
+        # 绘制网格线和周末底色，所有行共用同一张缓存位图，只取重绘区域对应的部分
+        ratio = self.devicePixelRatioF()
+        grid = self.day_table.grid_pixmap(self.day_width, self.height(), ratio)
+        source = clip.intersected(QRect(0, 0, int(grid.width() / ratio), int(grid.height() / ratio)))
+        if not source.isEmpty():
+            painter.drawPixmap(QRectF(source), grid, QRectF(source.x() * ratio, source.y() * ratio,
+                                                            source.width() * ratio, source.height() * ratio))
             
         # 绘制底部边框线
-        painter.setPen(QPen(QColor(200, 200, 200)))
-        painter.drawLine(0, self.height() - 1, self.width(), self.height() - 1)
+        if clip.bottom() >= self.height() - 1:
+            painter.setPen(self.BORDER_PEN)
+            painter.drawLine(clip.left(), self.height() - 1, clip.right() + 1, self.height() - 1)
 
 class GanttChart(ScrollArea):
     """甘特图主组件"""
     
+    # 可见区域上下额外创建的任务行数，滚动时减少空白占位
+    ROW_OVERSCAN = 5
+    
     def __init__(self, start_date, end_date, tasks, scheduler_manager, parent=None):
         super().__init__(parent)
         self.start_date = start_date
@@ -835,9 +1032,26 @@ class GanttChart(ScrollArea):
         self.tasks = tasks
         self.scheduler_manager = scheduler_manager
         self.day_width = 30
-        self.task_rows = {}  # 存储任务行组件的引用
+        self.task_rows = {}  # 存储已创建的任务行组件的引用
+        self._row_widgets = [None] * len(tasks)  # 按行索引保存任务行组件，未创建的为None
         self.header = None  # 初始化header属性
         
+        # 逐日信息，头部和所有任务行共享，日期范围变化时甘特图会整体重建
+        self.day_table = _DayTable(start_date, end_date)
+        
+        # 今天的日期，绘制时直接读取，由午夜定时器在跨天时更新
+        self.today = datetime.now().date()
+        self._midnight_timer = QTimer(self)
+        self._midnight_timer.setSingleShot(True)
+        self._midnight_timer.timeout.connect(self._roll_today)
+        self._schedule_midnight_roll()
+        
+        # 日宽度变化后在下一次事件循环中统一重排任务行，连续缩放只重排一次
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(0)
+        self._relayout_timer.timeout.connect(self._relayout_task_rows)
+        
         # 设置滚动区属性
         self.setWidgetResizable(True)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
@@ -864,7 +1078,8 @@ class GanttChart(ScrollArea):
         self.header_layout.addWidget(self.header_spacer)
         
         # 添加头部日期栏
-        self.header = GanttHeaderWidget(start_date, end_date, self.day_width)
+        self.header = GanttHeaderWidget(start_date, end_date, self.day_width,
+                                        day_table=self.day_table, chart=self)
         self.header_layout.addWidget(self.header)
         
         # 将头部容器添加到主布局
@@ -883,16 +1098,18 @@ class GanttChart(ScrollArea):
         self.gantt_layout.setSpacing(0)
         self.gantt_layout.setContentsMargins(0, 0, 0, 0)
         
-        # 添加任务行
+        # 为每个任务添加等高的占位，任务行组件在进入可见区域时才创建
         for i, task in enumerate(tasks):
             task["row_index"] = i
-            task_row = GanttTaskRow(task, start_date, end_date, self.day_width)
-            self.gantt_layout.addWidget(task_row)
-            self.task_rows[task.get("id")] = task_row
+            self.gantt_layout.addItem(QSpacerItem(0, GanttTaskRow.HEIGHT,
+                                                  QSizePolicy.Minimum, QSizePolicy.Fixed))
         
         # 添加弹性空间
         self.gantt_layout.addStretch(1)
         
+        # 占位不限制宽度，由甘特图区域保持与任务行相同的最小宽度
+        self.gantt_area.setMinimumWidth(int(len(self.day_table) * self.day_width))
+        
         # 添加甘特图区域到分割器
         self.splitter.addWidget(self.gantt_area)
         
@@ -912,6 +1129,10 @@ class GanttChart(ScrollArea):
         # 连接水平滚动条变化信号，同步标尺位置
         self.horizontalScrollBar().valueChanged.connect(self.sync_header_scroll)
         
+        # 垂直滚动时创建进入可见区域的任务行
+        self.verticalScrollBar().valueChanged.connect(self._populate_visible_rows)
+        QTimer.singleShot(0, self._populate_visible_rows)
+        
         # 连接分割器大小变化信号，更新头部标尺的偏移
         self.splitter.splitterMoved.connect(self.update_header_offset)
         
@@ -928,9 +1149,56 @@ class GanttChart(ScrollArea):
             
         return super().eventFilter(obj, event)
     
+    def resizeEvent(self, event):
+        """视口大小变化时补充创建可见的任务行"""
+        super().resizeEvent(event)
+        self._populate_visible_rows()
+        
+    def _populate_visible_rows(self, *args):
+        """创建与可见区域相交的任务行
+        
+        任务行在首次进入视口时才创建并替换对应的占位，已创建的行保留，
+        任务很多时避免一次性创建全部行组件
+        """
+        count = len(self._row_widgets)
+        if len(self.task_rows) >= count:
+            return
+        
+        # 可见区域在甘特图区域坐标系中的纵向范围
+        area_top = self.gantt_area.mapTo(self.main_widget, QPoint(0, 0)).y()
+        top = self.verticalScrollBar().value() - area_top
+        bottom = top + self.viewport().height()
+        
+        row_height = GanttTaskRow.HEIGHT
+        first = max(0, top // row_height - self.ROW_OVERSCAN)
+        last = min(count, bottom // row_height + 1 + self.ROW_OVERSCAN)
+        missing = [i for i in range(first, last) if self._row_widgets[i] is None]
+        if not missing:
+            return
+        
+        # 批量创建期间暂停更新，直接以甘特图区域为父组件创建，避免重新设置父组件
+        self.gantt_area.setUpdatesEnabled(False)
+        try:
+            for i in missing:
+                task = self.tasks[i]
+                task_row = GanttTaskRow(task, self.start_date, self.end_date, self.day_width,
+                                        self.gantt_area, day_table=self.day_table, chart=self)
+                
+                # 用任务行替换同一位置的占位
+                self.gantt_layout.takeAt(i)
+                self.gantt_layout.insertWidget(i, task_row)
+                task_row.show()
+                
+                self._row_widgets[i] = task_row
+                self.task_rows[task.get("id")] = task_row
+        finally:
+            self.gantt_area.setUpdatesEnabled(True)
+        
     def update_task_rows_width(self, new_day_width=None):
         """更新所有任务行的宽度
         
+        day_width立即更新，标尺和任务行的重排推迟到下一次事件循环
+        
         Args:
             new_day_width: 可选，指定新的日宽度，如果未提供则使用当前宽度
         """
@@ -942,13 +1210,41 @@ class GanttChart(ScrollArea):
         if self.header:
             self.header.updateDayWidth(self.day_width)
         
-        # 遍历所有任务行，更新它们的day_width
-        for task_id, task_row in self.task_rows.items():
-            task_row.day_width = self.day_width
-            task_row.update_layout()
+        self._relayout_timer.start()
+        
+    def _schedule_midnight_roll(self):
+        """安排在下一个午夜触发_roll_today"""
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        msecs = int((next_midnight - now).total_seconds() * 1000) + 1
+        self._midnight_timer.start(msecs)
+        
+    def _roll_today(self):
+        """跨越午夜：更新今天的日期，重绘今日线和任务条的逾期状态"""
+        self.today = datetime.now().date()
+        for task_row in self.task_rows.values():
+            if task_row.task_bar:
+                task_row.task_bar.update_tooltip()
+                task_row.task_bar.update()
+        if self.header:
+            self.header.update()
+        self.viewport().update()
+        self._schedule_midnight_roll()
+        
+    def _relayout_task_rows(self):
+        """按当前日宽度重排所有任务行"""
+        # 重排期间暂停甘特图区域的更新，恢复时统一重绘一次
+        self.gantt_area.setUpdatesEnabled(False)
+        try:
+            self.gantt_area.setMinimumWidth(int(len(self.day_table) * self.day_width))
             
-        # 触发重绘
-        self.gantt_area.update()
+            # 遍历所有任务行，更新它们的day_width
+            for task_id, task_row in self.task_rows.items():
+                task_row.day_width = self.day_width
+                task_row.update_layout()
+        finally:
+            # 恢复更新会触发整个区域重绘
+            self.gantt_area.setUpdatesEnabled(True)
     
     def create_task_list(self):
         """创建任务信息列表"""
@@ -1055,15 +1351,14 @@ class GanttChart(ScrollArea):
         current_h_scroll = self.horizontalScrollBar().value()
         current_v_scroll = self.verticalScrollBar().value()
         
-        print(f"甘特图视图: 正在更新任务 ID = {updated_task.get('id')}")
-        print(f"  标题: {updated_task.get('title')}")
-        print(f"  开始时间: {updated_task.get('start_time')}")
-        print(f"  结束时间: {updated_task.get('end_time')}")
+        logger.debug("甘特图视图: 正在更新任务 ID = %s，标题: %s，开始时间: %s，结束时间: %s",
+                     updated_task.get("id"), updated_task.get("title"),
+                     updated_task.get("start_time"), updated_task.get("end_time"))
         
         # 调用调度管理器的update_task方法，而不是手动更新日历视图
         # 这样可以利用调度管理器的广播通知机制，确保所有视图都得到更新
         if self.scheduler_manager.update_task(updated_task):
-            print("甘特图视图: 任务更新成功，调度管理器已通知相关视图更新")
+            logger.debug("甘特图视图: 任务更新成功，调度管理器已通知相关视图更新")
             
             # 仅在甘特图内部更新内存中的任务数据和视觉显示
             # 而不需要触发完整的日历视图刷新，因为调度管理器已经做了这个工作
@@ -1072,7 +1367,7 @@ class GanttChart(ScrollArea):
                 if task.get("id") == task_id:
                     # 更新内存中的任务数据
                     self.tasks[i] = updated_task
-                    print("甘特图视图: 内存中的任务数据已更新")
+                    logger.debug("甘特图视图: 内存中的任务数据已更新")
                     
                     # 更新对应的任务行
                     if task_id in self.task_rows:
@@ -1081,7 +1376,7 @@ class GanttChart(ScrollArea):
                         task_row.task_data = updated_task
                         # 重新计算任务条位置和大小
                         task_row.update_layout()
-                        print("甘特图视图: 任务行视觉显示已更新")
+                        logger.debug("甘特图视图: 任务行视觉显示已更新")
                     break
             
             # 恢复滚动位置
@@ -1098,10 +1393,10 @@ class GanttChart(ScrollArea):
                     duration=2000,
                     parent=self
                 )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            except Exception:
+                logger.exception("显示InfoBar时出错")
         else:
-            print("甘特图视图: 任务更新失败")
+            logger.warning("甘特图视图: 任务更新失败")
             # 显示错误消息
             try:
                 InfoBar.error(
@@ -1113,8 +1408,8 @@ class GanttChart(ScrollArea):
                     duration=2000,
                     parent=self
                 )
-            except Exception as e:
-                print(f"显示InfoBar时出错: {e}")
+            except Exception:
+                logger.exception("显示InfoBar时出错")
     
     def setScrollPosition(self, h_scroll, v_scroll):
         """设置滚动条位置"""
@@ -1126,7 +1421,7 @@ class GanttChart(ScrollArea):
         if not self.today_marker:
             return
             
-        today = datetime.now().date()
+        today = self.today
         
         # 确保今天在日期范围内
         if today < self.start_date or today > self.end_date:
@@ -1178,7 +1473,7 @@ class GanttChart(ScrollArea):
         
         # 如果启用了今日标记线
         if self.today_marker:
-            today = datetime.now().date()
+            today = self.today
             if self.start_date <= today <= self.end_date:
                 days_from_start = (today - self.start_date).days
                 x = days_from_start * self.day_width
@@ -1517,6 +1812,8 @@ class GanttView(ScrollArea):
             
         self.is_updating = True  # 设置更新标志
         
+        # 替换甘特图期间暂停更新，避免绘制清空后的中间状态
+        self.setUpdatesEnabled(False)
         try:
             # 清除旧的甘特图
             while self.gantt_container.count() > 0:
@@ -1544,6 +1841,7 @@ class GanttView(ScrollArea):
                 empty_label.setAlignment(Qt.AlignCenter)
                 self.gantt_container.addWidget(empty_label)
         finally:
+            self.setUpdatesEnabled(True)
             self.is_updating = False  # 清除更新标志
     
     def apply_filters(self, tasks):